@@ -1,9 +1 @@
-from .database import Base, engine, SessionLocal
-from .routers import product
-from .routers import order
-#from .models import product as product_model
-#from .models import order as order_model
-#from .schemas import product as product_schema
-#from .schemas import order as order_shema
-#from .crud import product as product_crud
-#from .crud import order as order_crud
+# Submodules are imported on demand so that importing `app` never touches the database.
@@ -0,0 +1,196 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.product import Product
+import numpy as np
+import logging
+import os
+import threading
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds after which the snapshot is reloaded, bounding staleness from writes in other workers
+QUOTE_SNAPSHOT_MAX_AGE = float(os.getenv("QUOTE_SNAPSHOT_MAX_AGE", "30"))
+
+# Compact in-memory snapshot of product prices and stock for quoting carts.
+# Products are stored in parallel arrays; `index_of[product_id]` maps an id to
+# its array index (-1 when unknown). The snapshot is loaded with one query and
+# then kept current from committed product writes in this process.
+class CatalogSnapshot:
+    def __init__(self, max_age: float = QUOTE_SNAPSHOT_MAX_AGE):
+        self.max_age = max_age
+        self.loaded_at = None
+        self._lock = threading.Lock()
+        # Held by the one thread (re)loading the snapshot
+        self._reload_lock = threading.Lock()
+        self._reset(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=np.int64))
+
+    def _reset(self, ids, prices, stock):
+        size = int(ids.max()) + 1 if len(ids) else 0
+        self.index_of = np.full(size, -1, dtype=np.int64)
+        self.index_of[ids] = np.arange(len(ids))
+        self.price = prices.astype(np.float64)
+        self.stock = stock.astype(np.int64)
+        self.count = len(ids)
+
+    # Load all products with a single query
+    def load(self, db: Session):
+        rows = db.query(Product.id, Product.price, Product.stock).all()
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        prices = np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))
+        stock = np.fromiter((r[2] for r in rows), dtype=np.int64, count=len(rows))
+        with self._lock:
+            self._reset(ids, prices, stock)
+            self.loaded_at = time.monotonic()
+        logger.info(f"Catalog snapshot loaded with {len(rows)} products")
+
+    def _is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.max_age
+
+    # Load the snapshot if it was never loaded or is older than max_age.
+    # Only one thread reloads a stale snapshot; the others keep quoting from the
+    # current arrays. Before the first load every caller waits for it.
+    def ensure_loaded(self, db: Session):
+        if not self._is_stale():
+            return
+        if self.loaded_at is None:
+            with self._reload_lock:
+                if self.loaded_at is None:
+                    self.load(db)
+            return
+        if self._reload_lock.acquire(blocking=False):
+            try:
+                if self._is_stale():
+                    self.load(db)
+            finally:
+                self._reload_lock.release()
+
+    # Apply committed product changes: upserts of (id, price, stock) and deleted ids.
+    # Copy-on-write: changes go into new arrays that replace all three references
+    # together, so quotes holding the previous arrays keep a consistent view.
+    def apply(self, upserts, deletes=()):
+        with self._lock:
+            if self.loaded_at is None:
+                return
+            index_of, price, stock, count = self.index_of.copy(), self.price.copy(), self.stock.copy(), self.count
+            for product_id in deletes:
+                if product_id < len(index_of):
+                    index_of[product_id] = -1
+            for product_id, product_price, product_stock in upserts:
+                if product_id >= len(index_of):
+                    grown = np.full(max(product_id + 1, 2 * len(index_of)), -1, dtype=np.int64)
+                    grown[:len(index_of)] = index_of
+                    index_of = grown
+                index = index_of[product_id]
+                if index < 0:
+                    if count == len(price):
+                        capacity = max(16, 2 * count)
+                        price = np.resize(price, capacity)
+                        stock = np.resize(stock, capacity)
+                    index = count
+                    count += 1
+                    index_of[product_id] = index
+                price[index] = product_price
+                stock[index] = product_stock
+            self.index_of, self.price, self.stock, self.count = index_of, price, stock, count
+
+    # Price and stock-check several carts at once.
+    # Each cart is a list of (product_id, quantity) lines. Returns one dict per cart
+    # with line prices, the total, unknown product ids and stock shortages.
+    def quote(self, carts):
+        with self._lock:
+            index_of, price, stock = self.index_of, self.price, self.stock
+
+        sizes = np.fromiter((len(c) for c in carts), dtype=np.int64, count=len(carts))
+        cart_of = np.repeat(np.arange(len(carts)), sizes)
+        lines = np.array([line for cart in carts for line in cart], dtype=np.int64).reshape(-1, 2)
+        product_ids, quantities = lines[:, 0], lines[:, 1]
+
+        # Map ids to array indexes; unknown ids get -1
+        known = (product_ids >= 0) & (product_ids < len(index_of))
+        index = np.full(len(product_ids), -1, dtype=np.int64)
+        index[known] = index_of[product_ids[known]]
+        found = index >= 0
+
+        unit_prices = np.zeros(len(index))
+        unit_prices[found] = price[index[found]]
+        line_totals = unit_prices * quantities
+        totals = np.bincount(cart_of, weights=line_totals, minlength=len(carts))
+
+        # Total demand per (cart, product) so repeated lines are checked together
+        key = cart_of[found] * max(len(price), 1) + index[found]
+        unique_keys, inverse = np.unique(key, return_inverse=True)
+        demand = np.bincount(inverse, weights=quantities[found]).astype(np.int64)
+        pair_cart = unique_keys // max(len(price), 1)
+        pair_index = unique_keys % max(len(price), 1)
+        available = stock[pair_index]
+        short = demand > available
+        pair_product = np.zeros(len(unique_keys), dtype=np.int64)
+        pair_product[inverse] = product_ids[found]
+
+        results = []
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+        for c in range(len(carts)):
+            start, end = offsets[c], offsets[c + 1]
+            results.append({
+                "lines": list(zip(
+                    product_ids[start:end].tolist(),
+                    quantities[start:end].tolist(),
+                    unit_prices[start:end].tolist(),
+                    line_totals[start:end].tolist()
+                )),
+                "total": float(totals[c]),
+                "missing_product_ids": product_ids[start:end][~found[start:end]].tolist(),
+                "insufficient": [],
+            })
+        for c, product_id, requested, avail in zip(
+            pair_cart[short].tolist(), pair_product[short].tolist(), demand[short].tolist(), available[short].tolist()
+        ):
+            results[c]["insufficient"].append((product_id, requested, avail))
+        return results
+
+# Snapshot shared by the application
+catalog_snapshot = CatalogSnapshot()
+
+# Collect product changes at flush time; they are applied only once the transaction commits
+@event.listens_for(Session, "after_flush")
+def _collect_product_changes(session, flush_context):
+    changes = session.info.setdefault("catalog_changes", {"upserts": {}, "deletes": set()})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Product):
+            changes["upserts"][obj.id] = (obj.id, obj.price, obj.stock)
+            changes["deletes"].discard(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Product):
+            changes["upserts"].pop(obj.id, None)
+            changes["deletes"].add(obj.id)
+
+@event.listens_for(Session, "after_commit")
+def _apply_product_changes(session):
+    session.info.pop("catalog_savepoints", None)
+    changes = session.info.pop("catalog_changes", None)
+    if changes:
+        catalog_snapshot.apply(changes["upserts"].values(), changes["deletes"])
+
+@event.listens_for(Session, "after_rollback")
+def _discard_product_changes(session):
+    session.info.pop("catalog_savepoints", None)
+    session.info.pop("catalog_changes", None)
+
+# Remember the collected changes when a savepoint starts, so that rolling the
+# savepoint back also drops the changes flushed inside it
+@event.listens_for(Session, "after_transaction_create")
+def _mark_savepoint(session, transaction):
+    if transaction.nested:
+        changes = session.info.get("catalog_changes", {"upserts": {}, "deletes": set()})
+        session.info.setdefault("catalog_savepoints", {})[transaction] = (
+            dict(changes["upserts"]), set(changes["deletes"])
+        )
+
+@event.listens_for(Session, "after_soft_rollback")
+def _restore_savepoint(session, previous_transaction):
+    saved = session.info.get("catalog_savepoints", {}).pop(previous_transaction, None)
+    if saved is not None:
+        session.info["catalog_changes"] = {"upserts": saved[0], "deletes": saved[1]}
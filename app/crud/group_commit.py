@@ -0,0 +1,221 @@
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+from app.crud.order import add_order, set_order_status
+from app.models.order import OrderStatus
+from app.schemas.order import OrderCreate
+from app.utils.allocation import AllocationStrategy
+from app.utils.metrics import register_collector
+import logging
+import os
+import queue
+import threading
+import time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds the writer collects order writes before committing them together (0 disables group commit)
+GROUP_COMMIT_WINDOW = float(os.getenv("ORDER_GROUP_COMMIT_MS", "0")) / 1000
+# Maximum number of writes committed in one transaction
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("ORDER_GROUP_COMMIT_MAX_BATCH", "64"))
+# Seconds a request waits for its write to start (and then to finish) before giving up
+GROUP_COMMIT_TIMEOUT = float(os.getenv("ORDER_GROUP_COMMIT_TIMEOUT", "30"))
+
+# Dedicated writer thread applying queued writes in shared transactions.
+# The first queued write opens a batch; writes arriving within `window` seconds
+# (up to `max_batch`) join it. Each write runs in its own savepoint, so a failing
+# write is rolled back and reported to its caller alone, and the batch is then
+# committed once. Callers get their write's result only after that commit.
+# Unexpected errors fail the current batch, never the thread; a writer thread
+# that died anyway is restarted by the next submit.
+class GroupCommitWriter:
+    def __init__(self, session_factory=None, window: float = GROUP_COMMIT_WINDOW,
+                 max_batch: int = GROUP_COMMIT_MAX_BATCH, timeout: float = GROUP_COMMIT_TIMEOUT):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.batches = 0
+        self.writes = 0
+        self.failed = 0
+        self._engine = None
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    # Queue `fn(db, *args)` for the next batch; the future resolves to its return value
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                if self._thread is not None:
+                    logger.error("Group commit writer thread died; restarting it")
+                if self.session_factory is None:
+                    # Import here so that importing this module never creates an engine
+                    from app.database import SQLALCHEMY_DATABASE_URL, create_savepoint_engine
+                    self._engine = create_savepoint_engine(SQLALCHEMY_DATABASE_URL)
+                    self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self._engine)
+                self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+                self._thread.start()
+            self._queue.put((fn, args, future))
+        return future
+
+    # Commit queued writes and stop the writer thread
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None and thread.is_alive():
+                self._queue.put(None)
+            else:
+                thread = None
+        if thread is not None:
+            thread.join()
+        if self._engine is not None:
+            self._engine.dispose()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            stopping = False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+            try:
+                self._apply(batch)
+            except Exception as e:
+                logger.error(f"Group commit writer failed a batch of {len(batch)} writes: {str(e)}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            if stopping:
+                return
+
+    # Apply one batch in a single transaction, each write in its own savepoint
+    def _apply(self, batch):
+        results = []
+        db = None
+        try:
+            db = self.session_factory()
+            for fn, args, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with db.begin_nested():
+                        result = fn(db, *args)
+                except Exception as e:
+                    self.failed += 1
+                    future.set_exception(e)
+                else:
+                    results.append((future, result))
+            db.commit()
+        except Exception as e:
+            logger.error(f"Group commit of {len(results)} writes failed: {str(e)}")
+            if db is not None:
+                db.rollback()
+            self.failed += len(results)
+            for future, _ in results:
+                future.set_exception(e)
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            if db is not None:
+                db.close()
+        self.batches += 1
+        self.writes += len(results)
+        for future, result in results:
+            future.set_result(result)
+
+    # Prometheus text-format lines for committed batches and writes
+    def metrics(self) -> list[str]:
+        return [
+            "# TYPE group_commit_batches_total counter",
+            f"group_commit_batches_total {self.batches}",
+            "# TYPE group_commit_writes_total counter",
+            f"group_commit_writes_total {self.writes}",
+            "# TYPE group_commit_failed_total counter",
+            f"group_commit_failed_total {self.failed}",
+        ]
+
+# Writer shared by the application for order writes
+order_writer = GroupCommitWriter()
+register_collector(order_writer.metrics)
+
+def _create_order(db, order: OrderCreate, strategy: AllocationStrategy | None) -> int:
+    return add_order(db, order, strategy).id
+
+def _update_order_status(db, order_id: int, status: OrderStatus) -> int | None:
+    db_order = set_order_status(db, order_id, status)
+    return db_order.id if db_order else None
+
+# Raised when a caller stops waiting for its write
+class WriteTimeout(HTTPException):
+    pass
+
+# Wait for a queued write and return its result. A write still queued at the
+# timeout is cancelled and never applied (503, safe to retry). A write that has
+# already started will commit or fail with its batch, so the caller waits for it
+# once more; if it is still undecided the caller gets 504 saying it may have
+# been applied, never an invitation to retry.
+def wait_for_write(writer: GroupCommitWriter, future: Future):
+    try:
+        return future.result(timeout=writer.timeout)
+    except FutureTimeoutError:
+        pass
+    if future.cancel():
+        logger.error(f"Order write not started within {writer.timeout} seconds; cancelled")
+        raise WriteTimeout(status_code=503, detail="Order writer is busy; the write was not applied, please retry")
+    try:
+        return future.result(timeout=writer.timeout)
+    except FutureTimeoutError:
+        logger.error(f"Order write still running after {2 * writer.timeout} seconds")
+        raise WriteTimeout(
+            status_code=504,
+            detail="Order write is still in progress and may have been applied; check the order before retrying"
+        )
+
+# Create an order through the group-commit writer and return its id once committed.
+# Errors are reported like create_order reports them.
+def submit_create_order(order: OrderCreate, strategy: AllocationStrategy | None = None,
+                        writer: GroupCommitWriter | None = None) -> int:
+    writer = writer or order_writer
+    logger.info(f"Queueing new order with data: {order.dict()}")
+    future = writer.submit(_create_order, order, strategy)
+    try:
+        return wait_for_write(writer, future)
+    except WriteTimeout:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating order: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error creating order: {str(e)}")
+
+# Update an order's status through the group-commit writer.
+# Returns the order id once committed, or None if the order does not exist.
+def submit_update_order_status(order_id: int, status: OrderStatus,
+                               writer: GroupCommitWriter | None = None) -> int | None:
+    writer = writer or order_writer
+    future = writer.submit(_update_order_status, order_id, status)
+    try:
+        return wait_for_write(writer, future)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating order status: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error updating order status: {str(e)}")
@@ -1,8 +1,11 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session, joinedload
-from app.models.order import Order, OrderItem, OrderStatus
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.models.order import Order, OrderItem, OrderItemAllocation, OrderStatus, TERMINAL_ORDER_STATUSES
 from app.schemas.order import OrderCreate
 from app.models.product import Product
+from app.crud.warehouse import get_candidate_locations
+from app.utils.allocation import AllocationError, AllocationStrategy, get_strategy
 import logging
 from datetime import datetime
 
@@ -10,62 +13,13 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
- # Create a new order with product availability check and stock update
-def create_order(db: Session, order: OrderCreate) -> Order:   
+# Create a new order with product availability check and stock update.
+# Products stocked per warehouse are allocated to locations by `strategy`
+# (defaults to the configured allocation strategy).
+def create_order(db: Session, order: OrderCreate, strategy: AllocationStrategy | None = None) -> Order:
     try:
         logger.info(f"Creating new order with data: {order.dict()}")
-        
-        # Initialize variables for order processing
-        total_price = 0
-        order_items = []
-        insufficient_stock = []
-        
-        # First pass: validate all products and check stock
-        for item in order.items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
-            if not product:
-                raise HTTPException(status_code=404, detail=f"Product with id {item.product_id} not found")
-            
-            if product.stock < item.quantity:
-                insufficient_stock.append({
-                    "product_id": product.id,
-                    "product_name": product.name,
-                    "requested": item.quantity,
-                    "available": product.stock
-                })
-        
-        # Return error if any product has insufficient stock
-        if insufficient_stock:
-            error_message = "Not enough stock for products:\n"
-            for item in insufficient_stock:
-                error_message += f"- {item['product_name']}: requested {item['requested']}, available {item['available']}\n"
-            raise HTTPException(status_code=400, detail=error_message)
-        
-        # Second pass: create order items and update stock
-        for item in order.items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
-            
-            # Update product stock and calculate total price
-            product.stock -= item.quantity
-            total_price += product.price * item.quantity
-            
-            # Create order item
-            db_item = OrderItem(
-                product_id=item.product_id,
-                quantity=item.quantity
-            )
-            order_items.append(db_item)
-            logger.info(f"Product {product.name} added to order. Stock: {product.stock}")
-
-        # Create and save the order
-        db_order = Order(
-            status=OrderStatus.PENDING,
-            price=total_price,
-            created_at=datetime.utcnow(),
-            items=order_items
-        )
-        
-        db.add(db_order)
+        db_order = add_order(db, order, strategy)
         db.commit()
         db.refresh(db_order)
         logger.info(f"Order created successfully with ID: {db_order.id}")
@@ -75,50 +29,191 @@ def create_order(db: Session, order: OrderCreate) -> Order:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating order: {str(e)}")
 
-# Get paginated list of all orders
+# Validate an order, reserve its stock and flush it without committing, so the
+# caller decides the transaction boundary (see app.crud.group_commit).
+# Raises HTTPException for unknown products and insufficient stock.
+def add_order(db: Session, order: OrderCreate, strategy: AllocationStrategy | None = None) -> Order:
+    # Initialize variables for order processing
+    total_price = 0
+    order_items = []
+    insufficient_stock = []
+
+    # Total requested quantity per product (a product may appear on several lines)
+    demand = {}
+    for item in order.items:
+        demand[item.product_id] = demand.get(item.product_id, 0) + item.quantity
+
+    # Load all requested products in a single query
+    products = {p.id: p for p in db.query(Product).filter(Product.id.in_(demand)).all()}
+    
+    # First pass: validate all products and check stock
+    for product_id, quantity in demand.items():
+        product = products.get(product_id)
+        if not product:
+            raise HTTPException(status_code=404, detail=f"Product with id {product_id} not found")
+        
+        if product.stock < quantity:
+            insufficient_stock.append({
+                "product_id": product.id,
+                "product_name": product.name,
+                "requested": quantity,
+                "available": product.stock
+            })
+    
+    # Return error if any product has insufficient stock
+    if insufficient_stock:
+        error_message = "Not enough stock for products:\n"
+        for item in insufficient_stock:
+            error_message += f"- {item['product_name']}: requested {item['requested']}, available {item['available']}\n"
+        raise HTTPException(status_code=400, detail=error_message)
+
+    # Allocate products stocked per warehouse using one query over all candidate locations
+    levels, locations = get_candidate_locations(db, list(demand))
+    located_demand = {pid: qty for pid, qty in demand.items() if pid in locations}
+    allocation = {}
+    if located_demand:
+        try:
+            allocation = (strategy or get_strategy()).allocate(located_demand, locations)
+        except AllocationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    # Second pass: create order items and update stock
+    for item in order.items:
+        product = products[item.product_id]
+        
+        # Update product stock and calculate total price
+        product.stock -= item.quantity
+        total_price += product.price * item.quantity
+        
+        # Create order item
+        db_item = OrderItem(
+            product_id=item.product_id,
+            quantity=item.quantity
+        )
+
+        # Reserve this line's share of the product allocation at each warehouse
+        for warehouse_id, quantity in _take_allocation(allocation.get(item.product_id), item.quantity):
+            levels[(item.product_id, warehouse_id)].quantity -= quantity
+            db_item.allocations.append(OrderItemAllocation(warehouse_id=warehouse_id, quantity=quantity))
+
+        order_items.append(db_item)
+        logger.info(f"Product {product.name} added to order. Stock: {product.stock}")
+
+    # Create and save the order
+    db_order = Order(
+        status=OrderStatus.PENDING,
+        price=total_price,
+        created_at=datetime.utcnow(),
+        items=order_items
+    )
+    
+    db.add(db_order)
+    db.flush()
+    return db_order
+
+# Consume `quantity` from the front of a product's (warehouse_id, quantity) picks
+def _take_allocation(picks: list | None, quantity: int) -> list:
+    taken = []
+    while picks and quantity > 0:
+        warehouse_id, available = picks[0]
+        take = min(available, quantity)
+        taken.append((warehouse_id, take))
+        quantity -= take
+        if take == available:
+            picks.pop(0)
+        else:
+            picks[0] = (warehouse_id, available - take)
+    return taken
+
+# Get paginated list of all orders with their items, products and allocations
 def get_orders(db: Session, skip: int = 0, limit: int = 100) -> list[Order]:   
-    return db.query(Order).offset(skip).limit(limit).all()
+    return db.query(Order).options(
+        selectinload(Order.items).joinedload(OrderItem.product),
+        selectinload(Order.items).selectinload(OrderItem.allocations)
+    ).offset(skip).limit(limit).all()
 
-# Get single order with related items and products
+# Get single order with related items, products and allocations
 def get_order(db: Session, order_id: int) -> Order | None:  
     return db.query(Order).options(
-        joinedload(Order.items).joinedload(OrderItem.product)
+        joinedload(Order.items).joinedload(OrderItem.product),
+        joinedload(Order.items).selectinload(OrderItem.allocations)
     ).filter(Order.id == order_id).first()
 
 # Update order status and handle errors
 def update_order_status(db: Session, order_id: int, status: OrderStatus) -> Order | None:
     try:
-        db_order = get_order(db, order_id)
+        db_order = set_order_status(db, order_id, status)
         if db_order:
-            logger.info(f"Current order status: {db_order.status}, new status: {status}")
-            # Update status and commit changes
-            db_order.status = status
             db.commit()
             db.refresh(db_order)
             logger.info(f"Order status updated successfully to {db_order.status}")
         return db_order
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         logger.error(f"Error updating order status: {str(e)}")
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error updating order status: {str(e)}")
 
+# Change an order's status and flush it without committing; returns None for unknown orders.
+# Orders in a terminal status are served as cacheable, so they may not change status (409).
+def set_order_status(db: Session, order_id: int, status: OrderStatus) -> Order | None:
+    db_order = get_order(db, order_id)
+    if db_order:
+        logger.info(f"Current order status: {db_order.status}, new status: {status}")
+        _check_not_terminal(db_order, status)
+        db_order.status = status
+        db.flush()
+    return db_order
+
+# Get a page of orders containing a product, newest first, optionally filtered by status.
+# The product filter is resolved through the (product_id, order_id) index and
+# orders are then fetched by primary key.
+def get_orders_for_product(
+    db: Session,
+    product_id: int,
+    status: OrderStatus | None = None,
+    skip: int = 0,
+    limit: int = 100
+) -> list[Order]:
+    order_ids = select(OrderItem.order_id).where(OrderItem.product_id == product_id)
+    query = db.query(Order).options(
+        selectinload(Order.items).joinedload(OrderItem.product),
+        selectinload(Order.items).selectinload(OrderItem.allocations)
+    ).filter(Order.id.in_(order_ids))
+    if status is not None:
+        query = query.filter(Order.status == status)
+    return query.order_by(Order.created_at.desc(), Order.id.desc()).offset(skip).limit(limit).all()
+
  # Get single order item by ID
 def get_order_item(db: Session, item_id: int) -> OrderItem | None:
     return db.query(OrderItem).filter(OrderItem.id == item_id).first()
 
-# Delete order and handle errors
+# Delete order and handle errors; orders in a terminal status cannot be deleted (409)
 def delete_order(db: Session, order_id: int) -> bool:
     try:
         db_order = get_order(db, order_id)
         if not db_order:
             return False
+        _check_not_terminal(db_order)
             
         db.delete(db_order)
         db.commit()
         logger.info(f"Order {order_id} deleted successfully")
         return True
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         logger.error(f"Error deleting order: {str(e)}")
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting order: {str(e)}")
 
+# Reject changing (or, without `status`, deleting) an order in a terminal status
+def _check_not_terminal(db_order: Order, status: OrderStatus | None = None):
+    if db_order.status in TERMINAL_ORDER_STATUSES and status != db_order.status:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Order {db_order.id} is {db_order.status.value} and can no longer be changed"
+        )
@@ -0,0 +1,90 @@
+from fastapi import HTTPException
+from sqlalchemy import select, update, func
+from sqlalchemy.orm import Session
+from app.models.order import Order, OrderItem, OrderItemAllocation, OrderStatus
+from app.models.picking import PickWave
+from app.models.product import Product
+from app.models.warehouse import Warehouse
+import logging
+from datetime import datetime
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Create a pick wave from up to `max_orders` of the oldest CONFIRMED orders.
+# The orders are claimed and moved to IN_PROGRESS with one set-based UPDATE, so
+# concurrent waves can never pick the same order.
+def create_wave(db: Session, max_orders: int) -> PickWave:
+    try:
+        wave = PickWave(created_at=datetime.utcnow(), order_count=0)
+        db.add(wave)
+        db.flush()
+
+        candidates = (
+            select(Order.id)
+            .where(Order.status == OrderStatus.CONFIRMED)
+            .order_by(Order.created_at, Order.id)
+            .limit(max_orders)
+        )
+        result = db.execute(
+            update(Order)
+            .where(Order.id.in_(candidates), Order.status == OrderStatus.CONFIRMED)
+            .values(status=OrderStatus.IN_PROGRESS, wave_id=wave.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            raise HTTPException(status_code=404, detail="No confirmed orders to pick")
+
+        wave.order_count = result.rowcount
+        db.commit()
+        db.refresh(wave)
+        logger.info(f"Pick wave {wave.id} created with {wave.order_count} orders")
+        return wave
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        logger.error(f"Error creating pick wave: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error creating pick wave: {str(e)}")
+
+# Get a single pick wave by ID
+def get_wave(db: Session, wave_id: int) -> PickWave | None:
+    return db.query(PickWave).filter(PickWave.id == wave_id).first()
+
+# Get the ids of the orders in a wave
+def get_wave_order_ids(db: Session, wave_id: int) -> list[int]:
+    return list(db.scalars(select(Order.id).where(Order.wave_id == wave_id).order_by(Order.id)))
+
+# Consolidated demand per warehouse and product across a wave's orders, in one
+# aggregate query. Lines are split by the warehouses their items were allocated
+# to; items of products without warehouse stock have no allocation and are
+# listed under warehouse None, last. Within a warehouse, lines are sorted by bin
+# location (products without a bin last) so pickers walk each aisle once.
+def get_pick_list(db: Session, wave_id: int):
+    quantity = func.coalesce(OrderItemAllocation.quantity, OrderItem.quantity)
+    return db.execute(
+        select(
+            OrderItemAllocation.warehouse_id,
+            Warehouse.code.label("warehouse_code"),
+            OrderItem.product_id,
+            Product.name,
+            Product.bin_location,
+            func.sum(quantity).label("quantity"),
+            func.count(func.distinct(OrderItem.order_id)).label("order_count"),
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .join(Product, Product.id == OrderItem.product_id)
+        .outerjoin(OrderItemAllocation, OrderItemAllocation.order_item_id == OrderItem.id)
+        .outerjoin(Warehouse, Warehouse.id == OrderItemAllocation.warehouse_id)
+        .where(Order.wave_id == wave_id)
+        .group_by(
+            OrderItemAllocation.warehouse_id, Warehouse.code,
+            OrderItem.product_id, Product.name, Product.bin_location
+        )
+        .order_by(
+            OrderItemAllocation.warehouse_id.is_(None), OrderItemAllocation.warehouse_id,
+            Product.bin_location.is_(None), Product.bin_location, OrderItem.product_id
+        )
+    ).all()
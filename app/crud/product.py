@@ -23,9 +23,47 @@ def create_product(db: Session, product: ProductCreate):
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating product: {str(e)}")
 
-# Get all products from the database
-def get_products(db: Session):
-    return db.query(Product).all()
+# Columns that can be selected with sparse field projection
+PRODUCT_FIELDS = ("id", "name", "description", "price", "stock", "bin_location")
+
+# Maximum number of ids bound into a single IN (...) clause
+IN_CHUNK_SIZE = 500
+
+# Resolve requested field names to columns; id is always included
+def _projection_columns(fields: list[str]):
+    unknown = [f for f in fields if f not in PRODUCT_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown product fields: {', '.join(unknown)}")
+    names = ["id"] + [f for f in PRODUCT_FIELDS if f in fields and f != "id"]
+    return [getattr(Product, name) for name in names]
+
+# Run a product query selecting either full rows or only the projected columns
+def _product_query(db: Session, fields: list[str] | None):
+    if fields is None:
+        return db.query(Product)
+    return db.query(*_projection_columns(fields))
+
+# Convert query results to ORM objects or plain dicts of the projected columns
+def _product_results(rows, fields: list[str] | None):
+    if fields is None:
+        return rows
+    return [dict(row._mapping) for row in rows]
+
+# Get all products from the database, optionally selecting only some columns
+def get_products(db: Session, fields: list[str] | None = None):
+    return _product_results(_product_query(db, fields).all(), fields)
+
+# Get products by id list in request order, optionally selecting only some columns.
+# Missing ids are skipped; large id lists are split into chunks of IN_CHUNK_SIZE.
+def get_products_by_ids(db: Session, ids: list[int], fields: list[str] | None = None):
+    unique_ids = list(dict.fromkeys(ids))
+    found = {}
+    for start in range(0, len(unique_ids), IN_CHUNK_SIZE):
+        chunk = unique_ids[start:start + IN_CHUNK_SIZE]
+        rows = _product_query(db, fields).filter(Product.id.in_(chunk)).all()
+        for row in _product_results(rows, fields):
+            found[row["id"] if fields is not None else row.id] = row
+    return [found[i] for i in unique_ids if i in found]
 
 # Get a single product by ID
 def get_product(db: Session, product_id: int):
@@ -39,6 +77,9 @@ def update_product(db: Session, product_id: int, product: ProductUpdate):
     
     # Update only the fields that are provided
     update_data = product.dict(exclude_unset=True)
+    # Stock of products held in warehouses is the sum of their locations
+    if "stock" in update_data and db_product.stock_levels:
+        raise HTTPException(status_code=400, detail="Product stock is managed per warehouse")
     for key, value in update_data.items():
         setattr(db_product, key, value)
     
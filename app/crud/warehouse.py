@@ -0,0 +1,89 @@
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.warehouse import Warehouse, WarehouseStock
+from app.models.product import Product
+from app.schemas.warehouse import WarehouseCreate
+from app.utils.allocation import StockLocation
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Create a new warehouse in the database
+def create_warehouse(db: Session, warehouse: WarehouseCreate):
+    try:
+        logger.info(f"Creating new warehouse with data: {warehouse.dict()}")
+        db_warehouse = Warehouse(**warehouse.dict())
+        db.add(db_warehouse)
+        db.commit()
+        db.refresh(db_warehouse)
+        logger.info(f"Warehouse created successfully with ID: {db_warehouse.id}")
+        return db_warehouse
+    except Exception as e:
+        logger.error(f"Error creating warehouse: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error creating warehouse: {str(e)}")
+
+# Get all warehouses ordered by allocation priority
+def get_warehouses(db: Session):
+    return db.query(Warehouse).order_by(Warehouse.priority, Warehouse.id).all()
+
+# Get a single warehouse by ID
+def get_warehouse(db: Session, warehouse_id: int):
+    return db.query(Warehouse).filter(Warehouse.id == warehouse_id).first()
+
+# Set the stock of a product at a warehouse and keep Product.stock equal to the total
+def set_stock_level(db: Session, warehouse_id: int, product_id: int, quantity: int):
+    if get_warehouse(db, warehouse_id) is None:
+        raise HTTPException(status_code=404, detail="Warehouse not found")
+    product = db.query(Product).filter(Product.id == product_id).first()
+    if product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    level = db.get(WarehouseStock, (product_id, warehouse_id))
+    if level is None:
+        level = WarehouseStock(product_id=product_id, warehouse_id=warehouse_id, quantity=quantity)
+        db.add(level)
+    else:
+        level.quantity = quantity
+    db.flush()
+
+    # Once a product is stocked per warehouse its global stock is the sum of its locations
+    product.stock = db.query(func.coalesce(func.sum(WarehouseStock.quantity), 0)).filter(
+        WarehouseStock.product_id == product_id
+    ).scalar()
+    db.commit()
+    db.refresh(level)
+    logger.info(f"Stock of product {product_id} at warehouse {warehouse_id} set to {quantity}")
+    return level
+
+# Get per-warehouse stock levels in bulk, optionally filtered by products and/or warehouses
+def get_stock_levels(db: Session, product_ids: list[int] | None = None, warehouse_ids: list[int] | None = None):
+    query = db.query(WarehouseStock)
+    if product_ids is not None:
+        query = query.filter(WarehouseStock.product_id.in_(product_ids))
+    if warehouse_ids is not None:
+        query = query.filter(WarehouseStock.warehouse_id.in_(warehouse_ids))
+    return query.order_by(WarehouseStock.product_id, WarehouseStock.warehouse_id).all()
+
+# Load every stock location for the given products in a single query.
+# Returns the WarehouseStock rows keyed by (product_id, warehouse_id) and the
+# candidate locations per product sorted by (priority, warehouse_id).
+def get_candidate_locations(db: Session, product_ids: list[int]):
+    rows = (
+        db.query(WarehouseStock, Warehouse.priority)
+        .join(Warehouse, Warehouse.id == WarehouseStock.warehouse_id)
+        .filter(WarehouseStock.product_id.in_(product_ids))
+        .order_by(Warehouse.priority, Warehouse.id)
+        .all()
+    )
+    levels = {}
+    locations = {}
+    for level, priority in rows:
+        levels[(level.product_id, level.warehouse_id)] = level
+        candidates = locations.setdefault(level.product_id, [])
+        if level.quantity > 0:
+            candidates.append(StockLocation(level.warehouse_id, priority, level.quantity))
+    return levels, locations
@@ -1,18 +1,130 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc, text
 from sqlalchemy.orm import sessionmaker, declarative_base
+from fastapi import Request
+import itertools
+import logging
 import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 # SQLite database URL
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./warehouse.db")
+# Comma-separated read replica URLs; reads go to the primary when unset
+SQLALCHEMY_READ_URLS = [url.strip() for url in os.getenv("DATABASE_READ_URLS", "").split(",") if url.strip()]
+# Seconds between health checks of each read replica
+READ_HEALTH_CHECK_INTERVAL = float(os.getenv("DATABASE_READ_HEALTH_INTERVAL", "5"))
+# Seconds a client is pinned to the primary after a write (0 disables read-your-writes)
+READ_YOUR_WRITES_WINDOW = float(os.getenv("READ_YOUR_WRITES_WINDOW", "0"))
+# Cookie carrying the time until which a client reads from the primary
+PRIMARY_PIN_COOKIE = "read_primary_until"
+
+# Create an engine, passing SQLite-specific connect args only to SQLite URLs
+def _create_engine(url: str):
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    return create_engine(url, connect_args=connect_args)
+
+# Create an engine whose sessions can nest savepoints (Session.begin_nested).
+# pysqlite does not emit BEGIN before a SAVEPOINT, so releasing the first
+# savepoint would commit; for SQLite the driver's transaction handling is turned
+# off and every transaction starts with BEGIN IMMEDIATE, taking the write lock up front.
+def create_savepoint_engine(url: str):
+    savepoint_engine = _create_engine(url)
+    if url.startswith("sqlite"):
+        @event.listens_for(savepoint_engine, "connect")
+        def _disable_driver_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(savepoint_engine, "begin")
+        def _begin_immediate(connection):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+    return savepoint_engine
 
 # Create database engine with SQLite
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = _create_engine(SQLALCHEMY_DATABASE_URL)
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Session factory for read-only sessions, bound per session to a replica engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 # Base class for declarative models
 Base = declarative_base()
 
+# Round-robin selection over read replicas with periodic health checks.
+# Unhealthy replicas are skipped until a later check succeeds; when no replica
+# is healthy, reads fall back to the primary engine. Health probes run outside
+# the router lock, so a slow replica only delays the request probing it.
+class ReadEngineRouter:
+    def __init__(self, engines, fallback, health_check_interval: float = READ_HEALTH_CHECK_INTERVAL):
+        self.engines = list(engines)
+        self.fallback = fallback
+        self.health_check_interval = health_check_interval
+        self._healthy = {id(e): True for e in self.engines}
+        self._checked_at = {id(e): 0.0 for e in self.engines}
+        self._cycle = itertools.cycle(self.engines) if self.engines else None
+        self._lock = threading.Lock()
+        for replica in self.engines:
+            event.listen(replica, "handle_error", self._on_error)
+
+    # Run a health check if the last one is older than the check interval.
+    # Concurrent callers use the last result while one of them probes.
+    def _check(self, engine) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_at[id(engine)] < self.health_check_interval:
+                return self._healthy[id(engine)]
+            self._checked_at[id(engine)] = now
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            healthy = True
+        except Exception as e:
+            logger.warning(f"Read replica {engine.url} failed health check: {str(e)}")
+            healthy = False
+        self._healthy[id(engine)] = healthy
+        return healthy
+
+    # Mark a replica unhealthy until its next health check
+    def mark_unhealthy(self, engine):
+        if id(engine) in self._healthy:
+            logger.warning(f"Read replica {engine.url} marked unhealthy")
+            with self._lock:
+                self._healthy[id(engine)] = False
+                self._checked_at[id(engine)] = time.monotonic()
+
+    # Connection-level errors on a replica take it out of rotation right away
+    def _on_error(self, context):
+        if context.is_disconnect or isinstance(context.sqlalchemy_exception, exc.OperationalError):
+            self.mark_unhealthy(context.engine)
+
+    # Get the next healthy replica engine, or the primary if none is healthy
+    def next_engine(self):
+        if not self.engines:
+            return self.fallback
+        for _ in range(len(self.engines)):
+            with self._lock:
+                candidate = next(self._cycle)
+            if self._check(candidate):
+                return candidate
+        return self.fallback
+
+# Router over the configured read replicas
+read_router = ReadEngineRouter([_create_engine(url) for url in SQLALCHEMY_READ_URLS], engine)
+
+# Check whether a client wrote recently enough to be pinned to the primary
+def is_pinned_to_primary(cookies) -> bool:
+    try:
+        return float(cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+# Close pooled connections of the primary and all read replicas
+def dispose_engines():
+    engine.dispose()
+    for replica in read_router.engines:
+        replica.dispose()
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -20,3 +132,32 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Open a read session on the next healthy replica. The connection is opened up
+# front; a replica that fails to connect is marked unhealthy and the next one
+# (eventually the primary) is tried instead.
+def _open_read_session():
+    for _ in range(len(read_router.engines) + 1):
+        read_engine = read_router.next_engine()
+        db = ReadSessionLocal(bind=read_engine)
+        if read_engine is read_router.fallback:
+            return db
+        try:
+            db.connection()
+            return db
+        except Exception as e:
+            logger.warning(f"Read replica {read_engine.url} unavailable: {str(e)}")
+            db.close()
+            read_router.mark_unhealthy(read_engine)
+    return SessionLocal()
+
+# Dependency to get a DB session for read-only handlers
+def get_read_db(request: Request):
+    if is_pinned_to_primary(request.cookies):
+        db = SessionLocal()
+    else:
+        db = _open_read_session()
+    try:
+        yield db
+    finally:
+        db.close()
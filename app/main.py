@@ -1,14 +1,40 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.routers import product as product_router
 from app.routers import order as order_router
-from app.database import Base, engine
+from app.routers import warehouse as warehouse_router
+from app.routers import picking as picking_router
+from app.routers import metrics as metrics_router
+from app.database import dispose_engines
+from app.crud.group_commit import order_writer
+from app.middleware import (
+    ReadYourWritesMiddleware, CompressionMiddleware, AdmissionControlMiddleware, SingleFlightMiddleware
+)
 
-# Create all database tables
-Base.metadata.create_all(bind=engine)
+# Application lifespan. Connections are opened lazily on first use and the
+# schema is managed by migrations (`python -m app.migrate`), not by workers.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Commit queued order writes, then close pooled connections on shutdown
+    order_writer.stop()
+    dispose_engines()
 
 # Initialize FastAPI application
-app = FastAPI(title="Warehouse API")
+app = FastAPI(title="Warehouse API", lifespan=lifespan)
+
+# Pin clients to the primary database for a short window after a write
+app.add_middleware(ReadYourWritesMiddleware)
+# Per-route concurrency limits, wait queues and rate limits with checkout priority
+app.add_middleware(AdmissionControlMiddleware)
+# Collapse identical concurrent GETs; only the leading request takes an admission slot
+app.add_middleware(SingleFlightMiddleware)
+# Negotiated gzip/brotli/zstd compression of large responses (outermost)
+app.add_middleware(CompressionMiddleware)
 
 # Include routers
 app.include_router(product_router)
 app.include_router(order_router)
+app.include_router(warehouse_router)
+app.include_router(picking_router)
+app.include_router(metrics_router)
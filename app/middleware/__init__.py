@@ -0,0 +1,4 @@
+from .read_your_writes import ReadYourWritesMiddleware
+from .compression import CompressionMiddleware
+from .admission import AdmissionControlMiddleware
+from .single_flight import SingleFlightMiddleware
@@ -0,0 +1,246 @@
+from collections import OrderedDict, deque
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from app.utils.metrics import register_collector
+import asyncio
+import math
+import os
+import re
+import time
+
+# Maximum number of requests processed concurrently by this worker
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "32"))
+# Slots only checkout and status-update requests may use
+ADMISSION_RESERVED_SLOTS = int(os.getenv("ADMISSION_RESERVED_SLOTS", "8"))
+# Per-client token bucket refill rate (requests/second, 0 disables) and burst size
+RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "0"))
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "20"))
+# Header carrying the client address set by a trusted reverse proxy (e.g. x-forwarded-for);
+# empty keys clients by peer address
+RATE_LIMIT_CLIENT_HEADER = os.getenv("RATE_LIMIT_CLIENT_HEADER", "").strip().lower()
+# Comma-separated peer addresses of the proxies whose client header is trusted
+RATE_LIMIT_TRUSTED_PROXIES = {p.strip() for p in os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "").split(",") if p.strip()}
+# Paths never subject to admission control
+EXEMPT_PATHS = {"/metrics", "/docs", "/redoc", "/openapi.json"}
+
+# Raised when a request is rejected by admission control
+class Rejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(reason)
+
+# A class of routes sharing a concurrency limit and a wait queue.
+# `reserved` classes may use the reserved slots; `priority` orders wake-ups (lower first).
+class RouteClass:
+    def __init__(
+        self,
+        name: str,
+        routes,
+        priority: int,
+        max_concurrency: int,
+        max_queue: int,
+        max_wait: float,
+        reserved: bool = False
+    ):
+        self.name = name
+        self.routes = [(method, re.compile(pattern)) for method, pattern in routes]
+        self.priority = priority
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.reserved = reserved
+
+    def matches(self, method: str, path: str) -> bool:
+        return any(m == method and p.match(path) for m, p in self.routes)
+
+# Default route classes. Checkout and status updates get the reserved share;
+# listings and exports can never take it.
+DEFAULT_ROUTE_CLASSES = [
+    RouteClass("checkout", [("POST", r"^/orders/?$")], priority=0,
+               max_concurrency=ADMISSION_MAX_CONCURRENCY, max_queue=200, max_wait=5.0, reserved=True),
+    RouteClass("status", [("PUT", r"^/orders/\d+/status$")], priority=0,
+               max_concurrency=ADMISSION_MAX_CONCURRENCY, max_queue=200, max_wait=5.0, reserved=True),
+    RouteClass("export", [("GET", r"^/exports?/")], priority=3,
+               max_concurrency=2, max_queue=10, max_wait=10.0),
+    RouteClass("listing", [
+        ("GET", r"^/orders/?$"),
+        ("GET", r"^/products/?$"),
+        ("POST", r"^/products/batch$"),
+        ("GET", r"^/products/\d+/orders$"),
+        ("GET", r"^/warehouses/stock$"),
+    ], priority=2, max_concurrency=max(1, ADMISSION_MAX_CONCURRENCY // 2), max_queue=50, max_wait=1.0),
+    RouteClass("default", [], priority=1,
+               max_concurrency=ADMISSION_MAX_CONCURRENCY, max_queue=100, max_wait=2.0),
+]
+
+# Per-client token buckets, evicting the least recently seen clients
+class TokenBuckets:
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+
+    # Take a token for `key`; returns 0 when allowed, else seconds until a token is available
+    def take(self, key: str, now: float | None = None) -> float:
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+# Concurrency slots with per-class limits, a reserved share and bounded wait queues
+class AdmissionController:
+    def __init__(self, route_classes=None, capacity: int = ADMISSION_MAX_CONCURRENCY,
+                 reserved: int = ADMISSION_RESERVED_SLOTS, buckets: TokenBuckets | None = None):
+        self.route_classes = route_classes or DEFAULT_ROUTE_CLASSES
+        self.by_priority = sorted(self.route_classes, key=lambda c: c.priority)
+        self.default_class = next(c for c in self.route_classes if c.name == "default")
+        self.capacity = capacity
+        self.reserved = min(reserved, capacity - 1)
+        self.buckets = buckets or TokenBuckets(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+        self.in_use = 0
+        self.in_flight = {c.name: 0 for c in self.route_classes}
+        self.queues = {c.name: deque() for c in self.route_classes}
+        self.admitted = {c.name: 0 for c in self.route_classes}
+        self.shed = {}
+
+    # Get the route class of a request
+    def classify(self, method: str, path: str) -> RouteClass:
+        return next((c for c in self.route_classes if c.matches(method, path)), self.default_class)
+
+    def _can_run(self, route_class: RouteClass) -> bool:
+        limit = self.capacity if route_class.reserved else self.capacity - self.reserved
+        return self.in_use < limit and self.in_flight[route_class.name] < route_class.max_concurrency
+
+    def _grant(self, route_class: RouteClass):
+        self.in_use += 1
+        self.in_flight[route_class.name] += 1
+        self.admitted[route_class.name] += 1
+
+    def _reject(self, route_class: RouteClass, status_code: int, reason: str, retry_after: float):
+        key = (route_class.name, reason)
+        self.shed[key] = self.shed.get(key, 0) + 1
+        return Rejected(status_code, reason, retry_after)
+
+    # Wake queued requests, highest priority first, while slots are free
+    def _wake(self):
+        for route_class in self.by_priority:
+            queue = self.queues[route_class.name]
+            while queue and self._can_run(route_class):
+                waiter = queue.popleft()
+                if not waiter.done():
+                    self._grant(route_class)
+                    waiter.set_result(True)
+
+    # Wait for a slot for a request of `route_class` from `client_key`
+    async def acquire(self, route_class: RouteClass, client_key: str):
+        retry = self.buckets.take(client_key)
+        if retry > 0:
+            raise self._reject(route_class, 429, "rate_limited", retry)
+
+        queue = self.queues[route_class.name]
+        if not queue and self._can_run(route_class):
+            self._grant(route_class)
+            return
+        if len(queue) >= route_class.max_queue:
+            raise self._reject(route_class, 503, "queue_full", route_class.max_wait)
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=route_class.max_wait)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Granted just as the deadline expired; keep the slot
+                return
+            waiter.cancel()
+            queue.remove(waiter)
+            raise self._reject(route_class, 503, "deadline", route_class.max_wait)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(route_class)
+            else:
+                waiter.cancel()
+                if waiter in queue:
+                    queue.remove(waiter)
+            raise
+
+    # Return a slot and hand it to the next queued request
+    def release(self, route_class: RouteClass):
+        self.in_use -= 1
+        self.in_flight[route_class.name] -= 1
+        self._wake()
+
+    # Prometheus text-format lines for queue depth, in-flight, admitted and shed counts
+    def metrics(self) -> list[str]:
+        lines = [
+            "# TYPE admission_in_flight gauge",
+            *[f'admission_in_flight{{route_class="{n}"}} {v}' for n, v in self.in_flight.items()],
+            "# TYPE admission_queue_depth gauge",
+            *[f'admission_queue_depth{{route_class="{n}"}} {len(q)}' for n, q in self.queues.items()],
+            "# TYPE admission_admitted_total counter",
+            *[f'admission_admitted_total{{route_class="{n}"}} {v}' for n, v in self.admitted.items()],
+            "# TYPE admission_shed_total counter",
+            *[f'admission_shed_total{{route_class="{n}",reason="{r}"}} {v}' for (n, r), v in sorted(self.shed.items())],
+        ]
+        return lines
+
+# Admission controller shared by the application
+admission_controller = AdmissionController()
+register_collector(admission_controller.metrics)
+
+# ASGI middleware applying admission control before requests reach the routers.
+# Rejected requests get 429 (rate limited) or 503 (queue full / deadline) with Retry-After.
+class AdmissionControlMiddleware:
+    def __init__(self, app, controller: AdmissionController | None = None,
+                 client_header: str = RATE_LIMIT_CLIENT_HEADER, trusted_proxies=RATE_LIMIT_TRUSTED_PROXIES):
+        self.app = app
+        self.controller = controller or admission_controller
+        self.client_header = client_header
+        self.trusted_proxies = set(trusted_proxies)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.controller.classify(scope["method"], scope["path"])
+        try:
+            await self.controller.acquire(route_class, _client_key(scope, self.client_header, self.trusted_proxies))
+        except Rejected as e:
+            response = JSONResponse(
+                {"detail": f"Request rejected by admission control: {e.reason}"},
+                status_code=e.status_code,
+                headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
+
+# Identify the client of a request by peer address. Behind a trusted proxy the
+# right-most address of `header` is used instead: it is the one that proxy added,
+# while anything left of it is client-supplied. Unauthenticated headers such as
+# API keys are never used, since callers could pick a new identity per request.
+def _client_key(scope, header: str = "", trusted_proxies=frozenset()) -> str:
+    client = scope.get("client")
+    peer = client[0] if client else "unknown"
+    if header and peer in trusted_proxies:
+        forwarded = Headers(scope=scope).get(header, "").split(",")[-1].strip()
+        if forwarded:
+            return forwarded
+    return peer
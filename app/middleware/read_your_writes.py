@@ -0,0 +1,38 @@
+from app.database import PRIMARY_PIN_COOKIE, READ_YOUR_WRITES_WINDOW
+import math
+import time
+
+# HTTP methods that never write
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# POST endpoints that only read and must not pin the client
+READ_ONLY_PATHS = {"/products/batch", "/orders/quote"}
+
+# ASGI middleware that pins a client to the primary after a successful write.
+# It sets a short-lived cookie that `get_read_db` checks before picking a replica,
+# so a client reads its own writes while replicas catch up.
+class ReadYourWritesMiddleware:
+    def __init__(self, app, window: float = READ_YOUR_WRITES_WINDOW, read_only_paths=READ_ONLY_PATHS):
+        self.app = app
+        self.window = window
+        self.read_only_paths = set(read_only_paths)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or self.window <= 0
+            or scope["method"] in SAFE_METHODS
+            or scope["path"] in self.read_only_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{PRIMARY_PIN_COOKIE}={time.time() + self.window:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
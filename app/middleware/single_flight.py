@@ -0,0 +1,158 @@
+from starlette.datastructures import Headers
+from app.database import PRIMARY_PIN_COOKIE
+from app.middleware.read_your_writes import READ_ONLY_PATHS
+from app.utils.metrics import register_collector
+import asyncio
+import os
+import re
+import time
+
+# Seconds a completed response is reused for identical requests (0 disables the micro-cache)
+SINGLE_FLIGHT_CACHE_SECONDS = float(os.getenv("SINGLE_FLIGHT_CACHE_MS", "0")) / 1000
+# GET routes whose identical concurrent requests are collapsed into one
+SINGLE_FLIGHT_ROUTES = [r"^/products/?$", r"^/products/\d+$", r"^/orders/?$", r"^/orders/\d+$"]
+# HTTP methods that never write
+SAFE_METHODS = {"GET", "HEAD"}
+# Upper bound on micro-cached responses; the cache is emptied when exceeded
+MAX_CACHE_ENTRIES = 1024
+
+# Counters for the coalescing ratio
+class SingleFlightStats:
+    def __init__(self):
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    # Share of eligible requests served without running the handler
+    @property
+    def coalescing_ratio(self) -> float:
+        return (self.coalesced + self.cache_hits) / self.requests if self.requests else 0.0
+
+    def metrics(self) -> list[str]:
+        return [
+            "# TYPE single_flight_requests_total counter",
+            f"single_flight_requests_total {self.requests}",
+            "# TYPE single_flight_executions_total counter",
+            f"single_flight_executions_total {self.executions}",
+            "# TYPE single_flight_coalesced_total counter",
+            f"single_flight_coalesced_total {self.coalesced}",
+            "# TYPE single_flight_cache_hits_total counter",
+            f"single_flight_cache_hits_total {self.cache_hits}",
+            "# TYPE single_flight_coalescing_ratio gauge",
+            f"single_flight_coalescing_ratio {self.coalescing_ratio:.4f}",
+        ]
+
+# Stats shared by the application
+single_flight_stats = SingleFlightStats()
+register_collector(single_flight_stats.metrics)
+
+# ASGI middleware collapsing identical concurrent GET requests (same path and
+# query string) into one execution whose status, headers and body are replayed
+# to every waiter. Successful responses can additionally be reused for
+# `cache_seconds`. Any write request (read-only POSTs such as quotes excepted)
+# clears that micro-cache when it starts and again once its response completes; GETs that overlapped a write are neither
+# cached nor joined by later requests. Clients pinned to the primary after a
+# write and conditional requests (whose 304 must not reach other clients)
+# bypass coalescing.
+class SingleFlightMiddleware:
+    def __init__(self, app, routes=SINGLE_FLIGHT_ROUTES, cache_seconds: float = SINGLE_FLIGHT_CACHE_SECONDS,
+                 stats: SingleFlightStats | None = None, read_only_paths=READ_ONLY_PATHS):
+        self.app = app
+        self.read_only_paths = set(read_only_paths)
+        self.routes = [re.compile(pattern) for pattern in routes]
+        self.cache_seconds = cache_seconds
+        self.stats = stats or single_flight_stats
+        self._in_flight = {}
+        self._cache = {}
+        # Incremented when a write starts and when it completes
+        self._generation = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] not in SAFE_METHODS:
+            if scope["path"] in self.read_only_paths:
+                await self.app(scope, receive, send)
+                return
+            self._invalidate()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self._invalidate()
+            return
+        headers = Headers(scope=scope)
+        if (
+            not any(p.match(scope["path"]) for p in self.routes)
+            or PRIMARY_PIN_COOKIE in headers.get("cookie", "")
+            or "if-none-match" in headers
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        self.stats.requests += 1
+        key = (scope["method"], scope["path"], scope.get("query_string", b""))
+
+        # Micro-cache hit, unless the client asked for a fresh response
+        cached = self._cache.get(key)
+        if cached is not None and "no-cache" not in headers.get("cache-control", ""):
+            expires, response = cached
+            if expires > time.monotonic():
+                self.stats.cache_hits += 1
+                await _replay(response, send)
+                return
+            del self._cache[key]
+
+        # Join an identical request already in flight
+        leader = self._in_flight.get(key)
+        if leader is not None:
+            response = await asyncio.shield(leader)
+            if response is not None:
+                self.stats.coalesced += 1
+                await _replay(response, send)
+                return
+            # The leader failed or its response cannot be shared; run this request alone
+            self.stats.executions += 1
+            await self.app(scope, receive, send)
+            return
+
+        leader = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = leader
+        generation = self._generation
+        self.stats.executions += 1
+        captured = {"start": None, "body": []}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                captured["start"] = message
+            elif message["type"] == "http.response.body":
+                captured["body"].append(message.get("body", b""))
+            await send(message)
+
+        response = None
+        try:
+            await self.app(scope, receive, capture)
+            start = captured["start"]
+            if start is not None and not any(name.lower() == b"set-cookie" for name, _ in start.get("headers", [])):
+                response = (start["status"], list(start.get("headers", [])), b"".join(captured["body"]))
+                if self.cache_seconds > 0 and start["status"] == 200 and generation == self._generation:
+                    if len(self._cache) >= MAX_CACHE_ENTRIES:
+                        self._cache.clear()
+                    self._cache[key] = (time.monotonic() + self.cache_seconds, response)
+        finally:
+            if self._in_flight.get(key) is leader:
+                del self._in_flight[key]
+            leader.set_result(response)
+
+    # Drop cached responses and stop new requests from joining GETs that may predate a write
+    def _invalidate(self):
+        self._generation += 1
+        self._cache.clear()
+        self._in_flight.clear()
+
+# Send a captured (status, headers, body) response
+async def _replay(response, send):
+    status, headers, body = response
+    await send({"type": "http.response.start", "status": status, "headers": list(headers)})
+    await send({"type": "http.response.body", "body": body})
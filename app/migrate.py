@@ -0,0 +1,27 @@
+from pathlib import Path
+import sys
+
+from alembic import command
+from alembic.config import Config
+
+# Repository root holding alembic.ini and the migrations directory
+ROOT = Path(__file__).resolve().parent.parent
+
+# Build the Alembic configuration for this project
+def get_config(connection=None) -> Config:
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "migrations"))
+    if connection is not None:
+        # Reuse the caller's connection (e.g. in tests) and leave logging alone
+        config.attributes["connection"] = connection
+        config.attributes["configure_logger"] = False
+    return config
+
+# Upgrade the database schema to `revision` (latest by default)
+def upgrade(revision: str = "head", connection=None) -> None:
+    command.upgrade(get_config(connection), revision)
+
+# Run migrations once before starting workers:
+#     python -m app.migrate [revision]
+if __name__ == "__main__":
+    upgrade(sys.argv[1] if len(sys.argv) > 1 else "head")
@@ -1,4 +1,6 @@
 from app.models.product import Product
 from app.models.order import Order
+from app.models.warehouse import Warehouse, WarehouseStock
+from app.models.picking import PickWave
 
-__all__ = ["Product", "Order"]
+__all__ = ["Product", "Order", "Warehouse", "WarehouseStock", "PickWave"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -16,6 +16,9 @@ class OrderStatus(enum.Enum):
     REFUNDED = "refunded"          # Order was returned and the payment refunded
     FAILED = "failed"              # Error occurred during order placement or payment
 
+# Order statuses with no further transitions; orders in them are never changed or deleted
+TERMINAL_ORDER_STATUSES = {OrderStatus.CANCELLED, OrderStatus.REFUNDED, OrderStatus.FAILED}
+
 # Order model representing the orders table in the database
 class Order(Base):
     __tablename__ = "orders"
@@ -27,21 +30,42 @@ class Order(Base):
         nullable=False,
         default=datetime.utcnow,
         server_default=func.now(),
+        index=True,
     )
-    status = Column(Enum(OrderStatus), nullable=False, default=OrderStatus.PENDING, server_default=OrderStatus.PENDING.value)
+    status = Column(Enum(OrderStatus), nullable=False, default=OrderStatus.PENDING, server_default=OrderStatus.PENDING.value, index=True)
     
     price = Column(Float, nullable=False)
+    # Pick wave the order was released in
+    wave_id = Column(Integer, ForeignKey("pick_waves.id", name="fk_orders_wave_id_pick_waves"), nullable=True, index=True)
 
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
+    wave = relationship("PickWave", back_populates="orders")
 
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        # Serves "orders containing product X" without touching the table rows
+        Index("ix_order_items_product_id_order_id", "product_id", "order_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"))
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), index=True)
     product_id = Column(Integer, ForeignKey("products.id"))
     quantity = Column(Integer, nullable=False)
     
     order = relationship("Order", back_populates="items")
     product = relationship("Product")
+    allocations = relationship("OrderItemAllocation", back_populates="order_item", cascade="all, delete-orphan")
+
+# Quantity of an order item reserved from a specific warehouse
+class OrderItemAllocation(Base):
+    __tablename__ = "order_item_allocations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    order_item_id = Column(Integer, ForeignKey("order_items.id", ondelete="CASCADE"), nullable=False, index=True)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+
+    order_item = relationship("OrderItem", back_populates="allocations")
+    warehouse = relationship("Warehouse")
 
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.database import Base
+
+# Pick wave: a batch of orders released to the pickers together
+class PickWave(Base):
+    __tablename__ = "pick_waves"
+
+    # Primary key
+    id = Column(Integer, primary_key=True, index=True)
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        server_default=func.now(),
+    )
+    # Number of orders claimed by the wave
+    order_count = Column(Integer, nullable=False, default=0)
+
+    orders = relationship("Order", back_populates="wave")
@@ -16,6 +16,10 @@ class Product(Base):
     price = Column(Float, nullable=False)
     # Available stock quantity
     stock = Column(Integer, nullable=False)
+    # Storage bin the product is picked from (e.g. "A-03-2"), used to order pick lists
+    bin_location = Column(String, nullable=True)
     
     # Relationship with order items
     order_items = relationship("OrderItem", back_populates="product")
+    # Relationship with per-warehouse stock levels
+    stock_levels = relationship("WarehouseStock", back_populates="product", cascade="all, delete-orphan")
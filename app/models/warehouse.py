@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, CheckConstraint
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+# Warehouse model representing the warehouses table in the database
+class Warehouse(Base):
+    __tablename__ = "warehouses"
+
+    # Primary key
+    id = Column(Integer, primary_key=True, index=True)
+    # Short unique warehouse code (e.g. "WH-EAST")
+    code = Column(String, nullable=False, unique=True)
+    # Warehouse name
+    name = Column(String, nullable=False)
+    # Distance rank used by allocation, lower means nearer / preferred
+    priority = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Relationship with per-product stock levels
+    stock_levels = relationship("WarehouseStock", back_populates="warehouse", cascade="all, delete-orphan")
+
+# Stock of a single product held at a single warehouse
+class WarehouseStock(Base):
+    __tablename__ = "warehouse_stock"
+    __table_args__ = (
+        CheckConstraint("quantity >= 0", name="ck_warehouse_stock_quantity"),
+    )
+
+    # Composite primary key (product_id, warehouse_id) so lookups by product use the PK index
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id", ondelete="CASCADE"), primary_key=True, index=True)
+    # Available quantity at this location
+    quantity = Column(Integer, nullable=False, default=0)
+
+    warehouse = relationship("Warehouse", back_populates="stock_levels")
+    product = relationship("Product", back_populates="stock_levels")
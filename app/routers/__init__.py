@@ -1,2 +1,5 @@
 from .product import router as product
 from .order import router as order
+from .warehouse import router as warehouse
+from .picking import router as picking
+from .metrics import router as metrics
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.utils.metrics import render_metrics
+
+# Initialize router with tags
+router = APIRouter(tags=["Metrics"])
+
+# Prometheus metrics endpoint
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return render_metrics()
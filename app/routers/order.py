@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import List, Union
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.schemas.order import OrderCreate, OrderRead, OrderStatus, SuccessMessage, OrderItemRead
+from app.database import get_db, get_read_db
+from app.schemas.order import OrderCreate, OrderRead, OrderStatus, SuccessMessage, OrderItemRead, QuoteRead
 from app.models.order import OrderStatus
 from app.crud.order import create_order, get_orders, get_order, update_order_status, get_order_item, delete_order
+from app.crud.catalog import catalog_snapshot
+from app.crud.group_commit import order_writer, submit_create_order, submit_update_order_status
+from app.utils.cache_control import set_cache_control, not_modified
 import logging
 
 # Configure logging
@@ -13,28 +17,46 @@ logger = logging.getLogger(__name__)
 # Initialize router with prefix and tags
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
-# Create new product endpoint
+# Create new order endpoint. With group commit enabled the order is written by
+# the shared writer and read back once its batch has committed.
 @router.post("/", response_model=SuccessMessage)
 def create_order_endpoint(order: OrderCreate, db: Session = Depends(get_db)):
-    db_order = create_order(db, order)
+    if order_writer.enabled:
+        db_order = get_order(db, submit_create_order(order))
+    else:
+        db_order = create_order(db, order)
     return SuccessMessage(
         message="Order successfully created",
         order=OrderRead.from_orm(db_order)
     )
 
+# Quote endpoint: price and stock-check one cart or a list of carts against the
+# in-memory catalog snapshot without placing an order
+@router.post("/quote", response_model=Union[QuoteRead, List[QuoteRead]])
+def quote_order_endpoint(order: Union[OrderCreate, List[OrderCreate]], db: Session = Depends(get_read_db)):
+    carts = order if isinstance(order, list) else [order]
+    catalog_snapshot.ensure_loaded(db)
+    quotes = catalog_snapshot.quote([[(i.product_id, i.quantity) for i in cart.items] for cart in carts])
+    results = [QuoteRead.from_quote(q) for q in quotes]
+    return results if isinstance(order, list) else results[0]
+
 # Get all orders endpoint
 @router.get("/", response_model=list[OrderRead])
-def read_orders(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    orders = get_orders(db)
-    return [OrderRead.from_orm(order) for order in orders]
+def read_orders(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                db: Session = Depends(get_read_db)):
+    set_cache_control(response, "revalidate")
+    orders = [OrderRead.from_orm(order) for order in get_orders(db)]
+    return not_modified(request, response, orders) or orders
 
 # Get single order endpoint
 @router.get("/{order_id}", response_model=OrderRead)
-def read_order(order_id: int, db: Session = Depends(get_db)):
+def read_order(order_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
     db_order = get_order(db, order_id)
     if db_order is None:
         raise HTTPException(status_code=404, detail="Order not found")
-    return OrderRead.from_orm(db_order)
+    set_cache_control(response, "revalidate")
+    order = OrderRead.from_orm(db_order)
+    return not_modified(request, response, order) or order
 
 # Update order status endpoint
 @router.put("/{order_id}/status", response_model=OrderRead)
@@ -49,10 +71,16 @@ def update_order_status_endpoint(
 ):
     try:
         logger.info(f"Updating order {order_id} status to {status}")
-        db_order = update_order_status(db, order_id, status)
+        if order_writer.enabled:
+            updated_id = submit_update_order_status(order_id, status)
+            db_order = get_order(db, updated_id) if updated_id is not None else None
+        else:
+            db_order = update_order_status(db, order_id, status)
         if not db_order:
             raise HTTPException(status_code=404, detail="Order not found")
         return OrderRead.from_orm(db_order)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error updating order status: {str(e)}")
         raise HTTPException(
@@ -62,7 +90,7 @@ def update_order_status_endpoint(
 
 # Get single order item endpoint
 @router.get("/items/{item_id}", response_model=OrderItemRead)
-def get_order_item_endpoint(item_id: int, db: Session = Depends(get_db)):
+def get_order_item_endpoint(item_id: int, db: Session = Depends(get_read_db)):
     db_item = get_order_item(db, item_id)
     if not db_item:
         raise HTTPException(status_code=404, detail="Order item not found")
@@ -75,6 +103,8 @@ def delete_order_endpoint(order_id: int, db: Session = Depends(get_db)):
         if delete_order(db, order_id):
             return SuccessMessage(message=f"Order {order_id} deleted successfully")
         raise HTTPException(status_code=404, detail="Order not found")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error deleting order: {str(e)}")
         raise HTTPException(
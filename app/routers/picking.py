@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.database import get_db, get_read_db
+from app.schemas.picking import WaveCreate, WaveRead
+from app.crud import picking as crud
+
+# Initialize router with prefix and tags
+router = APIRouter(prefix="/picking", tags=["Picking"])
+
+# Create pick wave endpoint: claims CONFIRMED orders and returns their pick list
+@router.post("/waves", response_model=WaveRead)
+def create_wave(wave: WaveCreate, db: Session = Depends(get_db)):
+    db_wave = crud.create_wave(db, wave.max_orders)
+    return WaveRead.from_wave(db_wave, crud.get_wave_order_ids(db, db_wave.id), crud.get_pick_list(db, db_wave.id))
+
+# Get pick wave endpoint
+@router.get("/waves/{wave_id}", response_model=WaveRead)
+def get_wave(wave_id: int, db: Session = Depends(get_read_db)):
+    db_wave = crud.get_wave(db, wave_id)
+    if db_wave is None:
+        raise HTTPException(status_code=404, detail="Pick wave not found")
+    return WaveRead.from_wave(db_wave, crud.get_wave_order_ids(db, wave_id), crud.get_pick_list(db, wave_id))
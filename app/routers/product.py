@@ -1,21 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.schemas.product import ProductCreate, ProductRead, ProductUpdate, SuccessMessage
+from app.schemas.product import (
+    ProductCreate, ProductRead, ProductUpdate, ProductProjection, ProductBatchRequest, SuccessMessage
+)
+from app.schemas.order import OrderRead
+from app.models.order import OrderStatus
 from app.crud import product as crud
-from app.database import SessionLocal
-from typing import List
+from app.crud.order import get_orders_for_product
+from app.database import get_db, get_read_db
+from app.utils.params import parse_id_list
+from app.utils.cache_control import set_cache_control, not_modified
+from typing import List, Optional
 
 # Initialize router with prefix and tags
 router = APIRouter(prefix="/products", tags=["Products"])
 
-# Database session dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # Create new product endpoint
 @router.post("/", response_model=SuccessMessage)
 def create_product(product: ProductCreate, db: Session = Depends(get_db)):
@@ -25,19 +24,55 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
         product=db_product
     )
 
-# Get all products endpoint
-@router.get("/", response_model=List[ProductRead])
-def list_products(db: Session = Depends(get_db)):
-    return crud.get_products(db)
+# Get all products endpoint.
+# `ids=1,2,3` restricts the result to those products and `fields=name,price`
+# selects only those columns (id is always returned).
+@router.get("/", response_model=List[ProductProjection], response_model_exclude_unset=True)
+def list_products(
+    response: Response,
+    ids: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    set_cache_control(response, "live")
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    id_list = parse_id_list(ids)
+    if id_list is not None:
+        return crud.get_products_by_ids(db, id_list, field_list)
+    return crud.get_products(db, field_list)
+
+# Bulk product read endpoint for id lists too large for a query string
+@router.post("/batch", response_model=List[ProductProjection], response_model_exclude_unset=True)
+def read_products_batch(request: ProductBatchRequest, db: Session = Depends(get_read_db)):
+    return crud.get_products_by_ids(db, request.ids, request.fields)
 
 # Get product by ID endpoint
 @router.get("/{product_id}", response_model=ProductRead)
-def get_product(product_id: int, db: Session = Depends(get_db)):
+def get_product(product_id: int, response: Response, db: Session = Depends(get_read_db)):
+    set_cache_control(response, "live")
     db_product = crud.get_product(db, product_id)
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     return db_product
 
+# Get orders containing a product endpoint, newest first
+@router.get("/{product_id}/orders", response_model=List[OrderRead])
+def list_product_orders(
+    product_id: int,
+    request: Request,
+    response: Response,
+    status: Optional[OrderStatus] = Query(None, description="Order status", enum=[s.value for s in OrderStatus]),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_read_db)
+):
+    if crud.get_product(db, product_id) is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    set_cache_control(response, "revalidate")
+    orders = get_orders_for_product(db, product_id, status=status, skip=skip, limit=limit)
+    orders = [OrderRead.from_orm(order) for order in orders]
+    return not_modified(request, response, orders) or orders
+
 # Update product endpoint
 @router.put("/{product_id}", response_model=SuccessMessage)
 def update_product(product_id: int, product: ProductUpdate, db: Session = Depends(get_db)):
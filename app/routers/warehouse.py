@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.schemas.warehouse import WarehouseCreate, WarehouseRead, StockLevelSet, StockLevelRead, SuccessMessage
+from app.crud import warehouse as crud
+from app.utils.params import parse_id_list
+from typing import List, Optional
+
+# Initialize router with prefix and tags
+router = APIRouter(prefix="/warehouses", tags=["Warehouses"])
+
+# Create new warehouse endpoint
+@router.post("/", response_model=SuccessMessage)
+def create_warehouse(warehouse: WarehouseCreate, db: Session = Depends(get_db)):
+    db_warehouse = crud.create_warehouse(db, warehouse)
+    return SuccessMessage(
+        message="Warehouse successfully created",
+        warehouse=db_warehouse
+    )
+
+# Get all warehouses endpoint
+@router.get("/", response_model=List[WarehouseRead])
+def list_warehouses(db: Session = Depends(get_db)):
+    return crud.get_warehouses(db)
+
+# Bulk per-warehouse availability endpoint, e.g. /warehouses/stock?product_ids=1,2,3
+@router.get("/stock", response_model=List[StockLevelRead])
+def list_stock_levels(
+    product_ids: Optional[str] = None,
+    warehouse_ids: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    return crud.get_stock_levels(
+        db,
+        product_ids=parse_id_list(product_ids, "product_ids"),
+        warehouse_ids=parse_id_list(warehouse_ids, "warehouse_ids")
+    )
+
+# Get warehouse by ID endpoint
+@router.get("/{warehouse_id}", response_model=WarehouseRead)
+def get_warehouse(warehouse_id: int, db: Session = Depends(get_db)):
+    db_warehouse = crud.get_warehouse(db, warehouse_id)
+    if db_warehouse is None:
+        raise HTTPException(status_code=404, detail="Warehouse not found")
+    return db_warehouse
+
+# Set product stock at a warehouse endpoint
+@router.put("/{warehouse_id}/stock/{product_id}", response_model=SuccessMessage)
+def set_stock_level(warehouse_id: int, product_id: int, stock: StockLevelSet, db: Session = Depends(get_db)):
+    level = crud.set_stock_level(db, warehouse_id, product_id, stock.quantity)
+    return SuccessMessage(
+        message="Stock level successfully updated",
+        stock=[level]
+    )
@@ -4,6 +4,7 @@ from datetime import datetime
 from enum import Enum
 from app.models.product import Product
 from app.models.order import OrderItem
+from app.schemas.product import MAX_PRODUCT_ID
 
 # Order status enum
 class OrderStatus(str, Enum):
@@ -17,10 +18,13 @@ class OrderStatus(str, Enum):
     REFUNDED = "refunded"          # Order was returned and the payment refunded
     FAILED = "failed"              # Error occurred during order placement or payment
 
+# Largest line quantity accepted
+MAX_QUANTITY = 2**31 - 1
+
 # Order item base model
 class OrderItemBase(BaseModel):
-    product_id: int
-    quantity: int = Field(..., gt=0)
+    product_id: int = Field(..., ge=1, le=MAX_PRODUCT_ID)
+    quantity: int = Field(..., gt=0, le=MAX_QUANTITY)
 
 # Order item create model
 class OrderItemCreate(OrderItemBase):
@@ -40,12 +44,18 @@ class ProductInfo(BaseModel):
             price=product.price
         )
 
+# Warehouse allocation of an order item
+class AllocationRead(BaseModel):
+    warehouse_id: int
+    quantity: int
+
 # Order item read model
 class OrderItemRead(BaseModel):
     item_id: int
     product: ProductInfo
     quantity: int
     total_price: float
+    allocations: List[AllocationRead] = []
 
     @classmethod
     def from_orm(cls, order_item: OrderItem):
@@ -53,7 +63,11 @@ class OrderItemRead(BaseModel):
             item_id=order_item.id,
             product=ProductInfo.from_orm(order_item.product),
             quantity=order_item.quantity,
-            total_price=order_item.product.price * order_item.quantity
+            total_price=order_item.product.price * order_item.quantity,
+            allocations=[
+                AllocationRead(warehouse_id=a.warehouse_id, quantity=a.quantity)
+                for a in order_item.allocations
+            ]
         )
 
 class OrderBase(BaseModel):
@@ -85,6 +99,44 @@ class OrderRead(BaseModel):
         from_attributes = True
 
 
+# Priced line of a cart quote
+class QuoteLine(BaseModel):
+    product_id: int
+    quantity: int
+    unit_price: float
+    line_total: float
+
+# Product whose requested quantity exceeds available stock
+class QuoteShortage(BaseModel):
+    product_id: int
+    requested: int
+    available: int
+
+# Price and availability quote for a cart
+class QuoteRead(BaseModel):
+    lines: List[QuoteLine]
+    total: float
+    available: bool
+    missing_product_ids: List[int] = []
+    insufficient: List[QuoteShortage] = []
+
+    # Build from a catalog snapshot quote in a single validation pass
+    @classmethod
+    def from_quote(cls, quote: dict):
+        return cls.model_validate({
+            "lines": [
+                {"product_id": p, "quantity": q, "unit_price": u, "line_total": t}
+                for p, q, u, t in quote["lines"]
+            ],
+            "total": quote["total"],
+            "available": not quote["missing_product_ids"] and not quote["insufficient"],
+            "missing_product_ids": quote["missing_product_ids"],
+            "insufficient": [
+                {"product_id": p, "requested": r, "available": a}
+                for p, r, a in quote["insufficient"]
+            ]
+        })
+
 # Schema for success message response
 class SuccessMessage(BaseModel):
     message: str
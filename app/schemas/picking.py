@@ -0,0 +1,59 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from itertools import groupby
+
+# Schema for creating a pick wave
+class WaveCreate(BaseModel):
+    max_orders: int = Field(100, gt=0, le=10000)
+
+# Consolidated pick list line for one product
+class PickListLine(BaseModel):
+    product_id: int
+    product_name: str
+    bin_location: Optional[str] = None
+    quantity: int
+    order_count: int
+
+# Pick list of one warehouse; warehouse_id is None for products not stocked per warehouse
+class WarehousePickList(BaseModel):
+    warehouse_id: Optional[int] = None
+    warehouse_code: Optional[str] = None
+    lines: List[PickListLine] = []
+
+# Schema for reading a pick wave with its pick lists
+class WaveRead(BaseModel):
+    id: int
+    created_at: datetime
+    order_count: int
+    order_ids: List[int] = []
+    pick_lists: List[WarehousePickList] = []
+
+    # Build from a wave, its order ids and get_pick_list rows (sorted by warehouse)
+    @classmethod
+    def from_wave(cls, wave, order_ids, pick_list):
+        return cls(
+            id=wave.id,
+            created_at=wave.created_at,
+            order_count=wave.order_count,
+            order_ids=order_ids,
+            pick_lists=[
+                WarehousePickList(
+                    warehouse_id=warehouse_id,
+                    warehouse_code=warehouse_code,
+                    lines=[
+                        PickListLine(
+                            product_id=row.product_id,
+                            product_name=row.name,
+                            bin_location=row.bin_location,
+                            quantity=row.quantity,
+                            order_count=row.order_count
+                        )
+                        for row in rows
+                    ]
+                )
+                for (warehouse_id, warehouse_code), rows in groupby(
+                    pick_list, key=lambda row: (row.warehouse_id, row.warehouse_code)
+                )
+            ]
+        )
@@ -1,5 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Annotated, Optional, List
+
+# Largest id accepted (SQLite INTEGER / int64); ids start at 1
+MAX_PRODUCT_ID = 2**63 - 1
 
 # Base product schema with common fields
 class ProductBase(BaseModel):
@@ -7,6 +10,7 @@ class ProductBase(BaseModel):
     description: str = Field(..., min_length=1, max_length=500)
     price: float = Field(..., gt=0)
     stock: int = Field(..., ge=0)
+    bin_location: Optional[str] = Field(None, max_length=32)
 
 # Schema for creating a new product
 class ProductCreate(ProductBase):
@@ -20,12 +24,31 @@ class ProductRead(ProductBase):
         # Enable ORM mode for SQLAlchemy models
         from_attributes = True
 
+# Schema for reading a sparse projection of product data
+class ProductProjection(BaseModel):
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    stock: Optional[int] = None
+    bin_location: Optional[str] = None
+
+    class Config:
+        # Enable ORM mode for SQLAlchemy models
+        from_attributes = True
+
+# Schema for bulk product reads by id list
+class ProductBatchRequest(BaseModel):
+    ids: List[Annotated[int, Field(ge=1, le=MAX_PRODUCT_ID)]] = Field(..., min_length=1)
+    fields: Optional[List[str]] = None
+
 # Schema for updating a product with optional fields
 class ProductUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = Field(None, min_length=1, max_length=500)
     price: Optional[float] = Field(None, gt=0)
     stock: Optional[int] = Field(None, ge=0)
+    bin_location: Optional[str] = Field(None, max_length=32)
 
 # Schema for success message response
 class SuccessMessage(BaseModel):
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+# Base warehouse schema with common fields
+class WarehouseBase(BaseModel):
+    code: str = Field(..., min_length=1, max_length=32)
+    name: str = Field(..., min_length=1, max_length=100)
+    priority: int = Field(0, ge=0)
+
+# Schema for creating a new warehouse
+class WarehouseCreate(WarehouseBase):
+    pass
+
+# Schema for reading warehouse data
+class WarehouseRead(WarehouseBase):
+    id: int
+
+    class Config:
+        # Enable ORM mode for SQLAlchemy models
+        from_attributes = True
+
+# Schema for setting the stock of a product at a warehouse
+class StockLevelSet(BaseModel):
+    quantity: int = Field(..., ge=0)
+
+# Schema for reading per-warehouse stock
+class StockLevelRead(BaseModel):
+    product_id: int
+    warehouse_id: int
+    quantity: int
+
+    class Config:
+        # Enable ORM mode for SQLAlchemy models
+        from_attributes = True
+
+# Schema for success message response
+class SuccessMessage(BaseModel):
+    message: str
+    warehouse: Optional[WarehouseRead] = None
+    stock: Optional[List[StockLevelRead]] = None
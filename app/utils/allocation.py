@@ -0,0 +1,115 @@
+from typing import Dict, List, NamedTuple
+import os
+
+# A candidate source of stock for one product
+class StockLocation(NamedTuple):
+    warehouse_id: int
+    priority: int
+    available: int
+
+# Raised when the candidate locations cannot cover the requested quantities
+class AllocationError(Exception):
+    def __init__(self, shortfalls: Dict[int, int]):
+        self.shortfalls = shortfalls
+        super().__init__(
+            "Cannot allocate stock for products: "
+            + ", ".join(f"{pid} (short {qty})" for pid, qty in shortfalls.items())
+        )
+
+# Result type: product_id -> list of (warehouse_id, quantity)
+Allocation = Dict[int, List[tuple]]
+
+# Base class for allocation strategies.
+# `demand` maps product_id to the total requested quantity and `locations` maps
+# product_id to its candidate locations sorted by (priority, warehouse_id).
+class AllocationStrategy:
+    name = "base"
+
+    def allocate(self, demand: Dict[int, int], locations: Dict[int, List[StockLocation]]) -> Allocation:
+        raise NotImplementedError
+
+# Split each line across the nearest warehouses until it is covered
+class NearestSplitStrategy(AllocationStrategy):
+    name = "nearest_split"
+
+    def allocate(self, demand, locations):
+        result = {}
+        shortfalls = {}
+        for product_id, quantity in demand.items():
+            picks, remaining = _fill_nearest(quantity, locations.get(product_id, []))
+            if remaining:
+                shortfalls[product_id] = remaining
+            result[product_id] = picks
+        if shortfalls:
+            raise AllocationError(shortfalls)
+        return result
+
+# Ship the whole order from one warehouse when possible, then each line from
+# one warehouse, and only split a line across warehouses as a last resort
+class SingleWarehouseFirstStrategy(AllocationStrategy):
+    name = "single_first"
+
+    def allocate(self, demand, locations):
+        # Per-warehouse view of the candidate rows
+        by_warehouse = {}
+        for product_id, candidates in locations.items():
+            for loc in candidates:
+                entry = by_warehouse.setdefault(loc.warehouse_id, [loc.priority, {}])
+                entry[1][product_id] = loc.available
+
+        # Whole-order fill from the nearest warehouse that has everything
+        full = [
+            (priority, warehouse_id)
+            for warehouse_id, (priority, stock) in by_warehouse.items()
+            if all(stock.get(pid, 0) >= qty for pid, qty in demand.items())
+        ]
+        if full:
+            _, warehouse_id = min(full)
+            return {pid: [(warehouse_id, qty)] for pid, qty in demand.items()}
+
+        # Per-line single-warehouse fill, falling back to a nearest split
+        result = {}
+        shortfalls = {}
+        for product_id, quantity in demand.items():
+            candidates = locations.get(product_id, [])
+            single = next((loc for loc in candidates if loc.available >= quantity), None)
+            if single is not None:
+                result[product_id] = [(single.warehouse_id, quantity)]
+                continue
+            picks, remaining = _fill_nearest(quantity, candidates)
+            if remaining:
+                shortfalls[product_id] = remaining
+            result[product_id] = picks
+        if shortfalls:
+            raise AllocationError(shortfalls)
+        return result
+
+# Take stock from candidates in order until quantity is covered
+def _fill_nearest(quantity: int, candidates: List[StockLocation]):
+    picks = []
+    remaining = quantity
+    for loc in candidates:
+        if remaining <= 0:
+            break
+        take = min(loc.available, remaining)
+        if take > 0:
+            picks.append((loc.warehouse_id, take))
+            remaining -= take
+    return picks, remaining
+
+# Registry of available strategies, keyed by name
+STRATEGIES = {
+    SingleWarehouseFirstStrategy.name: SingleWarehouseFirstStrategy,
+    NearestSplitStrategy.name: NearestSplitStrategy,
+}
+
+# Default strategy name, configurable via ALLOCATION_STRATEGY
+DEFAULT_STRATEGY = os.getenv("ALLOCATION_STRATEGY", SingleWarehouseFirstStrategy.name)
+
+# Get a strategy instance by name
+def get_strategy(name: str | None = None) -> AllocationStrategy:
+    name = name or DEFAULT_STRATEGY
+    try:
+        return STRATEGIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown allocation strategy: {name}")
@@ -0,0 +1,29 @@
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+import hashlib
+import json
+
+# Cache-Control policies by name
+CACHE_POLICIES = {
+    # Live data such as stock levels: never stored by caches
+    "live": "no-store",
+    # Data that may change at any time but can be stored and revalidated with its ETag.
+    # Orders use this whatever their status: items are served with the live product
+    # name and price, so even a terminal order's representation can change.
+    "revalidate": "no-cache",
+}
+
+# Set the Cache-Control header of a response from a named policy
+def set_cache_control(response: Response, policy: str) -> None:
+    response.headers["Cache-Control"] = CACHE_POLICIES[policy]
+
+# Set a weak ETag computed from the JSON form of `content` and return a 304
+# response if the request's If-None-Match already names it, else None
+def not_modified(request: Request, response: Response, content) -> Response | None:
+    body = json.dumps(jsonable_encoder(content), sort_keys=True, separators=(",", ":"))
+    etag = f'W/"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+    response.headers["ETag"] = etag
+    candidates = {tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")}
+    if etag.removeprefix("W/") in candidates or "*" in candidates:
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
@@ -0,0 +1,14 @@
+# Registered metric collectors; each returns lines in the Prometheus text format
+_collectors = []
+
+# Register a collector function called on every metrics scrape
+def register_collector(collector):
+    _collectors.append(collector)
+    return collector
+
+# Render all registered metrics as a Prometheus text exposition
+def render_metrics() -> str:
+    lines = []
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,16 @@
+from fastapi import HTTPException
+from typing import List, Optional
+from app.schemas.product import MAX_PRODUCT_ID
+
+# Parse a comma-separated list of integer ids (e.g. "1,2,3") from a query parameter.
+# Ids outside 1..MAX_PRODUCT_ID are rejected, as the database could not bind them.
+def parse_id_list(value: Optional[str], name: str = "ids") -> Optional[List[int]]:
+    if value is None:
+        return None
+    try:
+        ids = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: expected comma-separated integers")
+    if any(not 1 <= id <= MAX_PRODUCT_ID for id in ids):
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: ids must be between 1 and {MAX_PRODUCT_ID}")
+    return ids
@@ -0,0 +1,103 @@
+"""Benchmark warehouse allocation: candidate-location query plus strategy.
+
+Builds a throwaway SQLite database with WAREHOUSES x SKUS stock rows (each SKU
+stocked at a random `--density` fraction of warehouses) and times
+`get_candidate_locations` + `allocate` for random carts.
+
+    python -m benchmarks.bench_allocation --warehouses 100 --skus 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.product import Product
+from app.models.warehouse import Warehouse, WarehouseStock
+from app.crud.warehouse import get_candidate_locations
+from app.utils.allocation import STRATEGIES
+
+# Populate warehouses, products and per-location stock with bulk inserts
+def populate(engine, warehouses: int, skus: int, density: float, seed: int):
+    rng = random.Random(seed)
+    per_sku = max(1, int(warehouses * density))
+    with engine.begin() as conn:
+        conn.execute(insert(Warehouse), [
+            {"id": w, "code": f"WH-{w}", "name": f"Warehouse {w}", "priority": w}
+            for w in range(1, warehouses + 1)
+        ])
+        conn.execute(insert(Product), [
+            {"id": p, "name": f"SKU {p}", "description": "", "price": 1.0, "stock": 0}
+            for p in range(1, skus + 1)
+        ])
+        batch = []
+        for p in range(1, skus + 1):
+            for w in rng.sample(range(1, warehouses + 1), per_sku):
+                batch.append({"product_id": p, "warehouse_id": w, "quantity": rng.randint(0, 50)})
+            if len(batch) >= 50000:
+                conn.execute(insert(WarehouseStock), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(WarehouseStock), batch)
+
+# Time candidate lookup and allocation for random carts
+def run(session_factory, skus: int, cart_lines: int, iterations: int, strategy_name: str, seed: int):
+    rng = random.Random(seed)
+    strategy = STRATEGIES[strategy_name]()
+    query_times, allocate_times, failures = [], [], 0
+    for _ in range(iterations):
+        demand = {pid: rng.randint(1, 20) for pid in rng.sample(range(1, skus + 1), cart_lines)}
+        with session_factory() as db:
+            start = time.perf_counter()
+            _, locations = get_candidate_locations(db, list(demand))
+            query_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            try:
+                strategy.allocate(demand, locations)
+            except Exception:
+                failures += 1
+            allocate_times.append(time.perf_counter() - start)
+    return query_times, allocate_times, failures
+
+def _ms(values):
+    ordered = sorted(values)
+    return (
+        f"median {statistics.median(ordered) * 1000:.2f} ms, "
+        f"p95 {ordered[int(len(ordered) * 0.95) - 1] * 1000:.2f} ms"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--warehouses", type=int, default=100)
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--density", type=float, default=0.1)
+    parser.add_argument("--lines", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="single_first")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        start = time.perf_counter()
+        populate(engine, args.warehouses, args.skus, args.density, args.seed)
+        print(f"populated {args.warehouses} warehouses x {args.skus} SKUs "
+              f"(density {args.density}) in {time.perf_counter() - start:.1f} s")
+
+        session_factory = sessionmaker(bind=engine)
+        for lines in args.lines:
+            query_times, allocate_times, failures = run(
+                session_factory, args.skus, lines, args.iterations, args.strategy, args.seed
+            )
+            print(f"{lines:>4} lines: query {_ms(query_times)}; "
+                  f"allocate {_ms(allocate_times)}; unallocatable carts {failures}/{args.iterations}")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
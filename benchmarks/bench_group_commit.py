@@ -0,0 +1,85 @@
+"""Benchmark order creation with per-request commits and with group commit.
+
+Creates orders from `--threads` concurrent threads against a throwaway SQLite
+database, first with one commit per order (create_order) and then through the
+group-commit writer with a `--window-ms` collection window, and prints
+orders/sec for both.
+
+    python -m benchmarks.bench_group_commit --threads 32 --orders 2000 --window-ms 2
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Run `fn()` `orders` times spread over `threads` threads; returns (orders/sec, failures)
+def run(fn, threads: int, orders: int):
+    remaining = iter(range(orders))
+    lock = threading.Lock()
+    failures = []
+
+    def worker():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            try:
+                fn()
+            except Exception as e:
+                failures.append(e)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return orders / (time.perf_counter() - start), len(failures)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app reads DATABASE_URL at import time
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        subprocess.run([sys.executable, "-m", "app.migrate"], check=True, capture_output=True)
+
+        import logging
+        logging.disable(logging.INFO)
+        from app.database import engine, SessionLocal
+        from app.models.product import Product
+        from app.crud.order import create_order
+        from app.crud.group_commit import GroupCommitWriter, submit_create_order
+        from app.schemas.order import OrderCreate, OrderItemCreate
+
+        with SessionLocal() as db:
+            products = [Product(name=f"SKU {i}", description="", price=1.0, stock=10 ** 9) for i in range(100)]
+            db.add_all(products)
+            db.commit()
+            product_ids = [p.id for p in products]
+        order = OrderCreate(items=[OrderItemCreate(product_id=pid, quantity=1) for pid in product_ids[:3]])
+
+        def direct():
+            with SessionLocal() as db:
+                create_order(db, order)
+
+        rate, failed = run(direct, args.threads, args.orders)
+        print(f"commit per order: {rate:8.0f} orders/s ({failed} failed)")
+
+        writer = GroupCommitWriter(window=args.window_ms / 1000, max_batch=args.max_batch)
+        rate, failed = run(lambda: submit_create_order(order, writer=writer), args.threads, args.orders)
+        writer.stop()
+        print(f"group commit:     {rate:8.0f} orders/s ({failed} failed), "
+              f"{writer.writes / max(writer.batches, 1):.1f} orders per commit")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark cart quotes against the in-memory catalog snapshot.
+
+Loads `--products` products into a throwaway SQLite database and the catalog
+snapshot, then measures quotes/sec for carts of `--lines` lines, both calling
+the snapshot directly (single carts and batches) and through POST /orders/quote.
+
+    python -m benchmarks.bench_quote --products 100000 --lines 1000
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# Measure calls/sec of `fn` over at least `seconds`
+def rate(fn, seconds: float) -> float:
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--lines", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app reads DATABASE_URL at import time
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        subprocess.run([sys.executable, "-m", "app.migrate"], check=True, capture_output=True)
+
+        from sqlalchemy import insert
+        from fastapi.testclient import TestClient
+        from app.database import engine, SessionLocal
+        from app.models.product import Product
+        from app.crud.catalog import catalog_snapshot
+        from app.main import app
+
+        rng = random.Random(args.seed)
+        with engine.begin() as conn:
+            conn.execute(insert(Product), [
+                {"id": i, "name": f"SKU {i}", "description": "", "price": rng.uniform(1, 100), "stock": rng.randint(0, 1000)}
+                for i in range(1, args.products + 1)
+            ])
+        with SessionLocal() as db:
+            start = time.perf_counter()
+            catalog_snapshot.load(db)
+            print(f"snapshot load of {args.products} products: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        def cart():
+            return [(rng.randint(1, args.products), rng.randint(1, 5)) for _ in range(args.lines)]
+
+        single = cart()
+        batch = [cart() for _ in range(args.batch)]
+        print(f"snapshot, 1 cart/call:   {rate(lambda: catalog_snapshot.quote([single]), args.seconds):,.0f} quotes/sec")
+        batch_rate = rate(lambda: catalog_snapshot.quote(batch), args.seconds) * args.batch
+        print(f"snapshot, {args.batch} carts/call: {batch_rate:,.0f} quotes/sec")
+
+        body = {"items": [{"product_id": p, "quantity": q} for p, q in single]}
+        with TestClient(app) as client:
+            endpoint_rate = rate(lambda: client.post("/orders/quote", json=body), args.seconds)
+        print(f"POST /orders/quote:      {endpoint_rate:,.0f} quotes/sec")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark cold worker boot.
+
+Migrates a throwaway SQLite database once, then starts `--runs` fresh Python
+processes that each import `app.main`, run the lifespan startup and serve a
+first request. Reports import time, time to first response and total process
+wall time.
+
+    python -m benchmarks.bench_startup --runs 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Code run in each cold worker process
+WORKER = """
+import json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    client.get("/warehouses/")
+    ready = time.perf_counter()
+print(json.dumps({"import": imported - start, "first_response": ready - start}))
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        subprocess.run([sys.executable, "-m", "app.migrate"], check=True, env=env, capture_output=True)
+
+        results = {"import": [], "first_response": [], "process": []}
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            output = subprocess.run(
+                [sys.executable, "-c", WORKER], check=True, env=env, capture_output=True, text=True
+            ).stdout
+            results["process"].append(time.perf_counter() - start)
+            timings = json.loads(output.strip().splitlines()[-1])
+            results["import"].append(timings["import"])
+            results["first_response"].append(timings["first_response"])
+
+    for name, values in results.items():
+        print(f"{name:>15}: median {statistics.median(values) * 1000:.1f} ms, "
+              f"min {min(values) * 1000:.1f} ms, max {max(values) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
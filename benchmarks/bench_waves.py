@@ -0,0 +1,71 @@
+"""Benchmark pick wave generation.
+
+Creates `--orders` CONFIRMED orders of `--lines` lines over `--products`
+products in a throwaway SQLite database, then times one wave covering all of
+them: claiming the orders, the consolidated pick list and the order id list.
+
+    python -m benchmarks.bench_waves --orders 10000 --products 5000 --lines 5
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--lines", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app reads DATABASE_URL at import time
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        subprocess.run([sys.executable, "-m", "app.migrate"], check=True, capture_output=True)
+
+        from datetime import datetime, timedelta
+        from sqlalchemy import insert
+        from app.database import engine, SessionLocal
+        from app.models.order import Order, OrderItem, OrderStatus
+        from app.models.product import Product
+        from app.crud.picking import create_wave, get_pick_list, get_wave_order_ids
+
+        rng = random.Random(args.seed)
+        start = datetime(2024, 1, 1)
+        with engine.begin() as conn:
+            conn.execute(insert(Product), [
+                {"id": i, "name": f"SKU {i}", "description": "", "price": 1.0, "stock": 0,
+                 "bin_location": f"{chr(65 + i % 26)}-{i % 100:02d}-{i % 7}"}
+                for i in range(1, args.products + 1)
+            ])
+            conn.execute(insert(Order), [
+                {"id": i, "created_at": start + timedelta(seconds=i), "status": OrderStatus.CONFIRMED, "price": 1.0}
+                for i in range(1, args.orders + 1)
+            ])
+            conn.execute(insert(OrderItem), [
+                {"order_id": i, "product_id": rng.randint(1, args.products), "quantity": rng.randint(1, 5)}
+                for i in range(1, args.orders + 1) for _ in range(args.lines)
+            ])
+
+        with SessionLocal() as db:
+            t0 = time.perf_counter()
+            wave = create_wave(db, args.orders)
+            t1 = time.perf_counter()
+            pick_list = get_pick_list(db, wave.id)
+            t2 = time.perf_counter()
+            order_ids = get_wave_order_ids(db, wave.id)
+            t3 = time.perf_counter()
+
+        print(f"wave of {wave.order_count} orders ({args.orders * args.lines} lines)")
+        print(f"  claim orders:  {(t1 - t0) * 1000:8.1f} ms")
+        print(f"  pick list:     {(t2 - t1) * 1000:8.1f} ms ({len(pick_list)} products)")
+        print(f"  order ids:     {(t3 - t2) * 1000:8.1f} ms ({len(order_ids)} orders)")
+        print(f"  total:         {(t3 - t0) * 1000:8.1f} ms")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""warehouses
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('warehouses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('priority', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('code')
+    )
+    with op.batch_alter_table('warehouses', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_warehouses_id'), ['id'], unique=False)
+
+    op.create_table('warehouse_stock',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('warehouse_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.CheckConstraint('quantity >= 0', name='ck_warehouse_stock_quantity'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id', 'warehouse_id')
+    )
+    with op.batch_alter_table('warehouse_stock', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_warehouse_stock_warehouse_id'), ['warehouse_id'], unique=False)
+
+    op.create_table('order_item_allocations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_item_id', sa.Integer(), nullable=False),
+    sa.Column('warehouse_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['order_item_id'], ['order_items.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('order_item_allocations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_order_item_allocations_id'), ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('order_item_allocations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_order_item_allocations_id'))
+
+    op.drop_table('order_item_allocations')
+    with op.batch_alter_table('warehouse_stock', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_warehouse_stock_warehouse_id'))
+
+    op.drop_table('warehouse_stock')
+    with op.batch_alter_table('warehouses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_warehouses_id'))
+
+    op.drop_table('warehouses')
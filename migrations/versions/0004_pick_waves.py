@@ -0,0 +1,54 @@
+"""pick waves
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 11:44:00.703472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pick_waves',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('pick_waves', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_pick_waves_id'), ['id'], unique=False)
+
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('wave_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_orders_wave_id'), ['wave_id'], unique=False)
+        batch_op.create_foreign_key('fk_orders_wave_id_pick_waves', 'pick_waves', ['wave_id'], ['id'])
+
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('bin_location', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_column('bin_location')
+
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_orders_wave_id_pick_waves', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_orders_wave_id'))
+        batch_op.drop_column('wave_id')
+
+    with op.batch_alter_table('pick_waves', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_pick_waves_id'))
+
+    op.drop_table('pick_waves')
@@ -1,12 +1,18 @@
 import os
 import pytest
+
+# Point the application at the test database before any app module is imported
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.database import Base
 from app.models.product import Product
-from app.models.order import Order, OrderItem
+from app.models.order import Order, OrderItem, OrderItemAllocation
+from app.models.warehouse import Warehouse, WarehouseStock
+from app.models.picking import PickWave
 
 # Use in-memory database for tests
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -32,8 +38,12 @@ def test_session(test_engine):
         yield session
     finally:
         # Clear all tables after each test
+        session.query(OrderItemAllocation).delete()
         session.query(OrderItem).delete()
         session.query(Order).delete()
+        session.query(PickWave).delete()
+        session.query(WarehouseStock).delete()
+        session.query(Warehouse).delete()
         session.query(Product).delete()
         session.commit()
         session.close()
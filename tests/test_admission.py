@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.middleware.admission import (
+    AdmissionController, AdmissionControlMiddleware, RouteClass, Rejected, TokenBuckets
+)
+
+def _classes(max_wait: float = 0.05, max_queue: int = 10):
+    return [
+        RouteClass("checkout", [("POST", r"^/orders/?$")], priority=0,
+                   max_concurrency=10, max_queue=max_queue, max_wait=max_wait, reserved=True),
+        RouteClass("listing", [("GET", r"^/orders/?$")], priority=2,
+                   max_concurrency=10, max_queue=max_queue, max_wait=max_wait),
+        RouteClass("default", [], priority=1,
+                   max_concurrency=10, max_queue=max_queue, max_wait=max_wait),
+    ]
+
+def test_classify_routes():
+    """Tests that requests are mapped to their route class"""
+    controller = AdmissionController(_classes(), capacity=2, reserved=1)
+    assert controller.classify("POST", "/orders/").name == "checkout"
+    assert controller.classify("GET", "/orders").name == "listing"
+    assert controller.classify("GET", "/orders/5").name == "default"
+
+def test_reserved_slots_kept_for_checkout():
+    """Tests that listings cannot take the reserved share and are shed at their deadline"""
+    async def scenario():
+        controller = AdmissionController(_classes(), capacity=2, reserved=1)
+        listing, checkout = controller.classify("GET", "/orders/"), controller.classify("POST", "/orders/")
+        await controller.acquire(listing, "a")
+        with pytest.raises(Rejected) as exc_info:
+            await controller.acquire(listing, "b")
+        assert (exc_info.value.status_code, exc_info.value.reason) == (503, "deadline")
+        await controller.acquire(checkout, "c")
+        assert controller.in_use == 2
+        assert controller.shed == {("listing", "deadline"): 1}
+    asyncio.run(scenario())
+
+def test_queued_request_admitted_on_release():
+    """Tests that a waiting request gets the slot freed by a finished one"""
+    async def scenario():
+        controller = AdmissionController(_classes(max_wait=1.0), capacity=1, reserved=0)
+        listing = controller.classify("GET", "/orders/")
+        await controller.acquire(listing, "a")
+        waiter = asyncio.create_task(controller.acquire(listing, "b"))
+        await asyncio.sleep(0)
+        assert len(controller.queues["listing"]) == 1
+        controller.release(listing)
+        await waiter
+        assert controller.in_flight["listing"] == 1
+    asyncio.run(scenario())
+
+def test_full_queue_rejects_immediately():
+    """Tests the bounded wait queue"""
+    async def scenario():
+        controller = AdmissionController(_classes(max_wait=1.0, max_queue=0), capacity=1, reserved=0)
+        listing = controller.classify("GET", "/orders/")
+        await controller.acquire(listing, "a")
+        with pytest.raises(Rejected) as exc_info:
+            await controller.acquire(listing, "b")
+        assert exc_info.value.reason == "queue_full"
+    asyncio.run(scenario())
+
+def test_token_bucket():
+    """Tests per-client token bucket refill"""
+    buckets = TokenBuckets(rate=1.0, burst=2)
+    assert buckets.take("a", now=0.0) == 0
+    assert buckets.take("a", now=0.0) == 0
+    assert buckets.take("a", now=0.0) == pytest.approx(1.0)
+    assert buckets.take("b", now=0.0) == 0
+    assert buckets.take("a", now=1.5) == 0
+
+def test_middleware_rate_limits_with_retry_after():
+    """Tests that rate-limited requests get 429 with Retry-After"""
+    app = FastAPI()
+
+    @app.get("/orders/")
+    def orders():
+        return []
+
+    controller = AdmissionController(_classes(), capacity=4, reserved=1, buckets=TokenBuckets(rate=0.1, burst=1))
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+    client = TestClient(app)
+
+    assert client.get("/orders/").status_code == 200
+    response = client.get("/orders/")
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert 'admission_shed_total{route_class="listing",reason="rate_limited"} 1' in controller.metrics()
+    assert controller.in_use == 0
+
+def test_rate_limit_keys_on_trusted_client_address():
+    """Tests that API key headers do not create new identities and forwarded addresses count only from trusted proxies"""
+    def make_client(**options):
+        app = FastAPI()
+
+        @app.get("/orders/")
+        def orders():
+            return []
+
+        controller = AdmissionController(_classes(), capacity=4, reserved=1, buckets=TokenBuckets(rate=0.1, burst=1))
+        app.add_middleware(AdmissionControlMiddleware, controller=controller, **options)
+        return TestClient(app)
+
+    client = make_client()
+    assert client.get("/orders/", headers={"X-API-Key": "a"}).status_code == 200
+    assert client.get("/orders/", headers={"X-API-Key": "b"}).status_code == 429
+
+    untrusted = make_client(client_header="x-forwarded-for", trusted_proxies={"10.0.0.1"})
+    assert untrusted.get("/orders/", headers={"X-Forwarded-For": "1.1.1.1"}).status_code == 200
+    assert untrusted.get("/orders/", headers={"X-Forwarded-For": "2.2.2.2"}).status_code == 429
+
+    # TestClient connects from "testclient"; the right-most forwarded address is the proxy's view
+    proxied = make_client(client_header="x-forwarded-for", trusted_proxies={"testclient"})
+    assert proxied.get("/orders/", headers={"X-Forwarded-For": "1.1.1.1"}).status_code == 200
+    assert proxied.get("/orders/", headers={"X-Forwarded-For": "2.2.2.2"}).status_code == 200
+    assert proxied.get("/orders/", headers={"X-Forwarded-For": "9.9.9.9, 1.1.1.1"}).status_code == 429
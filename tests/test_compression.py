@@ -0,0 +1,99 @@
+import gzip
+import brotli
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.database import get_read_db
+from app.main import app as warehouse_app
+from app.middleware.compression import CompressionMiddleware, negotiate_encoding
+from app.models.order import Order, OrderStatus
+
+BODY = "warehouse " * 500
+
+def _client():
+    app = FastAPI()
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BODY.encode()] * 3), media_type="text/plain")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+def _raw(response) -> bytes:
+    return b"".join(response.iter_raw())
+
+def test_negotiate_encoding():
+    """Tests Accept-Encoding negotiation with q-values and server preference"""
+    assert negotiate_encoding("gzip, br, zstd") == "zstd"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert negotiate_encoding("*;q=0.1, zstd;q=0") == "br"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("") is None
+
+def test_compresses_large_responses():
+    """Tests that each negotiated encoding round-trips the body"""
+    decoders = {
+        "gzip": gzip.decompress,
+        "br": brotli.decompress,
+        "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+    }
+    client = _client()
+    for encoding, decode in decoders.items():
+        with client.stream("GET", "/large", headers={"Accept-Encoding": encoding}) as response:
+            raw = _raw(response)
+        assert response.headers["content-encoding"] == encoding
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) == len(raw)
+        assert decode(raw).decode() == BODY
+
+def test_small_responses_are_not_compressed():
+    """Tests the size threshold"""
+    response = _client().get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+def test_streaming_responses_are_compressed():
+    """Tests chunked compression of streaming responses"""
+    with _client().stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = _raw(response)
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode() == BODY * 3
+
+def test_orders_are_revalidated_with_etags(test_session: Session):
+    """Tests that orders of any status must be revalidated and that their ETag yields 304"""
+    live = Order(status=OrderStatus.PENDING, price=1.0)
+    done = Order(status=OrderStatus.CANCELLED, price=1.0)
+    test_session.add_all([live, done])
+    test_session.commit()
+
+    warehouse_app.dependency_overrides[get_read_db] = lambda: test_session
+    try:
+        client = TestClient(warehouse_app)
+        for path in (f"/orders/{live.id}", f"/orders/{done.id}", "/orders/"):
+            response = client.get(path)
+            assert response.headers["cache-control"] == "no-cache"
+            etag = response.headers["etag"]
+            revalidated = client.get(path, headers={"If-None-Match": etag})
+            assert revalidated.status_code == 304
+            assert revalidated.headers["etag"] == etag
+        assert client.get("/orders/", headers={"If-None-Match": 'W/"stale"'}).status_code == 200
+
+        etag = client.get(f"/orders/{done.id}").headers["etag"]
+        done.status = OrderStatus.REFUNDED
+        test_session.commit()
+        assert client.get(f"/orders/{done.id}", headers={"If-None-Match": etag}).status_code == 200
+        assert client.get("/products/").headers["cache-control"] == "no-store"
+    finally:
+        warehouse_app.dependency_overrides.clear()
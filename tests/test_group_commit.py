@@ -0,0 +1,207 @@
+import threading
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import Base, create_savepoint_engine, get_db
+from app.crud.catalog import catalog_snapshot
+from app.crud.group_commit import (
+    GroupCommitWriter, order_writer, submit_create_order, submit_update_order_status, wait_for_write
+)
+from app.models.order import Order, OrderStatus
+from app.models.product import Product
+from app.schemas.order import OrderCreate, OrderItemCreate
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_savepoint_engine(f"sqlite:///{tmp_path / 'group.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+@pytest.fixture
+def writer(session_factory):
+    writer = GroupCommitWriter(session_factory, window=0.2, max_batch=64)
+    yield writer
+    writer.stop()
+
+def _add_product(session_factory, stock: int) -> int:
+    with session_factory() as db:
+        product = Product(name="Grouped", description="Grouped", price=2.0, stock=stock)
+        db.add(product)
+        db.commit()
+        return product.id
+
+# Run `fn(i)` for i in range(n) concurrently; returns (results, errors) by index
+def _run_concurrently(n: int, fn):
+    results, errors = {}, {}
+
+    def call(i):
+        try:
+            results[i] = fn(i)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+def test_concurrent_orders_share_one_commit(session_factory, writer):
+    """Tests that concurrent orders are committed in one batch and each caller gets its own id"""
+    product_id = _add_product(session_factory, 100)
+    order = OrderCreate(items=[OrderItemCreate(product_id=product_id, quantity=1)])
+
+    results, errors = _run_concurrently(10, lambda i: submit_create_order(order, writer=writer))
+
+    assert not errors
+    assert len(set(results.values())) == 10
+    assert writer.batches == 1 and writer.writes == 10
+    with session_factory() as db:
+        assert sorted(o.id for o in db.query(Order).all()) == sorted(results.values())
+        assert db.get(Product, product_id).stock == 90
+
+def test_stock_failure_rejects_only_its_order(session_factory, writer):
+    """Tests that orders exceeding stock fail alone while the rest of the batch commits"""
+    product_id = _add_product(session_factory, 3)
+    order = OrderCreate(items=[OrderItemCreate(product_id=product_id, quantity=1)])
+
+    results, errors = _run_concurrently(5, lambda i: submit_create_order(order, writer=writer))
+
+    assert len(results) == 3 and len(errors) == 2
+    for error in errors.values():
+        assert isinstance(error, HTTPException)
+        assert "Not enough stock" in error.detail
+    assert writer.batches == 1 and writer.failed == 2
+    with session_factory() as db:
+        assert db.query(Order).count() == 3
+        assert db.get(Product, product_id).stock == 0
+
+def test_status_update_through_writer(session_factory, writer):
+    """Tests status updates and unknown orders through the writer"""
+    product_id = _add_product(session_factory, 10)
+    order_id = submit_create_order(
+        OrderCreate(items=[OrderItemCreate(product_id=product_id, quantity=1)]), writer=writer
+    )
+
+    assert submit_update_order_status(order_id, OrderStatus.CONFIRMED, writer=writer) == order_id
+    assert submit_update_order_status(999999, OrderStatus.CONFIRMED, writer=writer) is None
+    with session_factory() as db:
+        assert db.get(Order, order_id).status == OrderStatus.CONFIRMED
+
+def test_batch_errors_do_not_stop_the_writer(session_factory):
+    """Tests that a batch failing outside any write fails its callers and the writer keeps running"""
+    product_id = _add_product(session_factory, 10)
+    order = OrderCreate(items=[OrderItemCreate(product_id=product_id, quantity=1)])
+    calls = []
+
+    def flaky_factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+        return session_factory()
+
+    writer = GroupCommitWriter(flaky_factory, window=0.001, timeout=5)
+    try:
+        with pytest.raises(HTTPException) as exc:
+            submit_create_order(order, writer=writer)
+        assert "database unavailable" in exc.value.detail
+        assert submit_create_order(order, writer=writer) > 0
+    finally:
+        writer.stop()
+
+def test_dead_writer_thread_is_restarted(session_factory, writer):
+    """Tests that submitting to a writer whose thread died starts a new thread"""
+    product_id = _add_product(session_factory, 10)
+    dead = threading.Thread(target=lambda: None)
+    dead.start()
+    dead.join()
+    writer._thread = dead
+    writer.window = 0.001
+
+    assert submit_create_order(OrderCreate(items=[OrderItemCreate(product_id=product_id, quantity=1)]), writer=writer) > 0
+    assert writer._thread is not dead and writer._thread.is_alive()
+
+def test_waiting_for_a_write_times_out(session_factory):
+    """Tests that a write still queued at the timeout is cancelled and reported as safe to retry (503)"""
+    release = threading.Event()
+    writer = GroupCommitWriter(session_factory, window=0.001, timeout=0.05)
+    try:
+        writer.submit(lambda db: release.wait())
+        with pytest.raises(HTTPException) as exc:
+            submit_update_order_status(1, OrderStatus.CONFIRMED, writer=writer)
+        assert exc.value.status_code == 503
+        assert "not applied" in exc.value.detail
+    finally:
+        release.set()
+        writer.stop()
+
+def test_started_write_is_awaited_after_the_timeout(session_factory):
+    """Tests that a write already running is waited for instead of being reported as retryable"""
+    release = threading.Event()
+    writer = GroupCommitWriter(session_factory, window=0.001, timeout=0.1)
+    try:
+        finishes = writer.submit(lambda db: release.wait(0.15) or "committed")
+        assert wait_for_write(writer, finishes) == "committed"
+
+        stuck = writer.submit(lambda db: release.wait())
+        with pytest.raises(HTTPException) as exc:
+            wait_for_write(writer, stuck)
+        assert exc.value.status_code == 504
+        assert "may have been applied" in exc.value.detail
+    finally:
+        release.set()
+        writer.stop()
+
+def test_rolled_back_savepoint_does_not_reach_snapshot(session_factory):
+    """Tests that product changes flushed in a rolled-back savepoint are not applied to the catalog snapshot"""
+    product_id = _add_product(session_factory, 10)
+    with session_factory() as db:
+        catalog_snapshot.load(db)
+        try:
+            with pytest.raises(ValueError):
+                with db.begin_nested():
+                    db.get(Product, product_id).price = 99.0
+                    db.flush()
+                    raise ValueError
+            with db.begin_nested():
+                db.get(Product, product_id).stock = 7
+            db.commit()
+
+            quote, = catalog_snapshot.quote([[(product_id, 1)]])
+            assert quote["total"] == 2.0
+            assert catalog_snapshot.stock[catalog_snapshot.index_of[product_id]] == 7
+        finally:
+            catalog_snapshot.loaded_at = None
+
+def test_order_endpoints_with_group_commit(session_factory, monkeypatch):
+    """Tests POST /orders and PUT /orders/{id}/status with group commit enabled"""
+    product_id = _add_product(session_factory, 1)
+    monkeypatch.setattr(order_writer, "window", 0.005)
+    monkeypatch.setattr(order_writer, "session_factory", session_factory)
+    # Request sessions use a regular engine on the same database, as get_db does
+    request_engine = create_engine(session_factory.kw["bind"].url)
+
+    def override_get_db():
+        with sessionmaker(bind=request_engine)() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        payload = {"items": [{"product_id": product_id, "quantity": 1}]}
+        created = client.post("/orders/", json=payload)
+        assert created.status_code == 200
+        order_id = created.json()["order"]["id"]
+
+        assert client.post("/orders/", json=payload).status_code == 500
+        updated = client.put(f"/orders/{order_id}/status", params={"status": "confirmed"})
+        assert updated.json()["status"] == "confirmed"
+    finally:
+        app.dependency_overrides.clear()
+        order_writer.stop()
+        request_engine.dispose()
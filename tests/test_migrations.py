@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, MetaData, String, Table, create_engine, func, inspect, text
+from app.database import Base
+from app.migrate import get_config, upgrade
+from app.models.order import OrderStatus
+
+# Schema built by `create_all` before migrations were introduced (revision 0001)
+baseline_metadata = MetaData()
+Table(
+    "products", baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False),
+    Column("description", String, nullable=False),
+    Column("price", Float, nullable=False),
+    Column("stock", Integer, nullable=False),
+)
+Table(
+    "orders", baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("created_at", DateTime, nullable=False, server_default=func.now()),
+    Column("status", Enum(OrderStatus), nullable=False, server_default=OrderStatus.PENDING.value),
+    Column("price", Float, nullable=False),
+)
+Table(
+    "order_items", baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("order_id", Integer, ForeignKey("orders.id", ondelete="CASCADE")),
+    Column("product_id", Integer, ForeignKey("products.id")),
+    Column("quantity", Integer, nullable=False),
+)
+
+def test_migrations_match_models(tmp_path):
+    """Tests that upgrading to head produces exactly the schema of the models"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    with engine.begin() as connection:
+        upgrade("head", connection=connection)
+
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    assert diff == []
+
+def test_initial_revision_matches_baseline_schema(tmp_path):
+    """Tests that revision 0001 creates exactly the schema of databases built with create_all"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'initial.db'}")
+    with engine.begin() as connection:
+        upgrade("0001", connection=connection)
+
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), baseline_metadata)
+    assert diff == []
+
+def test_stamped_baseline_database_upgrades_to_head(tmp_path):
+    """Tests that a create_all database stamped with 0001 upgrades to head and keeps its data"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    baseline_metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO products (id, name, description, price, stock) VALUES (1, 'Old', '', 1.0, 5)"))
+        connection.execute(text("INSERT INTO orders (id, status, price) VALUES (1, 'CONFIRMED', 1.0)"))
+        connection.execute(text("INSERT INTO order_items (order_id, product_id, quantity) VALUES (1, 1, 1)"))
+
+    with engine.begin() as connection:
+        command.stamp(get_config(connection), "0001")
+    with engine.begin() as connection:
+        upgrade("head", connection=connection)
+
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+        assert diff == []
+        assert connection.execute(text("SELECT stock FROM products WHERE id = 1")).scalar() == 5
+        assert connection.execute(text("SELECT count(*) FROM order_items")).scalar() == 1
+
+def test_migrations_downgrade_to_base(tmp_path):
+    """Tests that every migration can be reverted"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    with engine.begin() as connection:
+        upgrade("head", connection=connection)
+    with engine.begin() as connection:
+        command.downgrade(get_config(connection), "base")
+
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+
+def test_importing_app_does_not_touch_database(tmp_path):
+    """Tests that importing the application neither connects nor creates the schema"""
+    db_file = tmp_path / "untouched.db"
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_file}")
+    subprocess.run([sys.executable, "-c", "import app.main"], check=True, env=env)
+    assert not db_file.exists()
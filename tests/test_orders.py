@@ -1,8 +1,16 @@
 import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import get_db
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.models.order import Order, OrderItem, OrderStatus
 from app.models.product import Product
-from app.crud.order import create_order, get_order, get_orders, update_order_status, delete_order
+from app.schemas.order import OrderRead
+from app.schemas.warehouse import WarehouseCreate
+from app.crud.warehouse import create_warehouse, set_stock_level
+from app.crud.order import create_order, get_order, get_orders, get_orders_for_product, update_order_status, delete_order
 from app.schemas.order import OrderCreate, OrderItemCreate
 from datetime import datetime
 
@@ -87,6 +95,60 @@ def test_get_all_orders(test_session: Session):
     # Check that all orders are retrieved
     assert len(orders) == 2
 
+def test_get_orders_for_product(test_session: Session):
+    """Tests listing orders containing a product, newest first and by status"""
+    product = Product(**test_product_data)
+    other = Product(**test_product_data)
+    test_session.add_all([product, other])
+    test_session.commit()
+
+    first = create_order(test_session, OrderCreate(items=[OrderItemCreate(product_id=product.id, quantity=1)]))
+    second = create_order(test_session, OrderCreate(items=[
+        OrderItemCreate(product_id=other.id, quantity=1),
+        OrderItemCreate(product_id=product.id, quantity=1),
+    ]))
+    create_order(test_session, OrderCreate(items=[OrderItemCreate(product_id=other.id, quantity=1)]))
+    update_order_status(test_session, first.id, OrderStatus.CONFIRMED)
+
+    orders = get_orders_for_product(test_session, product.id)
+    assert [o.id for o in orders] == [second.id, first.id]
+    assert len(orders[0].items) == 2
+
+    confirmed = get_orders_for_product(test_session, product.id, status=OrderStatus.CONFIRMED)
+    assert [o.id for o in confirmed] == [first.id]
+
+    assert [o.id for o in get_orders_for_product(test_session, product.id, skip=1, limit=1)] == [first.id]
+
+def test_order_reads_load_allocations_eagerly(test_session: Session):
+    """Tests that reading orders with items and allocations takes a fixed number of queries"""
+    warehouse = create_warehouse(test_session, WarehouseCreate(code="EAGER", name="Eager"))
+    products = [Product(**test_product_data) for _ in range(5)]
+    test_session.add_all(products)
+    test_session.commit()
+    for product in products:
+        set_stock_level(test_session, warehouse.id, product.id, 100)
+    order_ids = [
+        create_order(test_session, OrderCreate(items=[OrderItemCreate(product_id=p.id, quantity=1) for p in products])).id
+        for _ in range(3)
+    ]
+    test_session.expunge_all()
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(test_session.get_bind(), "before_cursor_execute", record)
+    try:
+        read = OrderRead.from_orm(get_order(test_session, order_ids[0]))
+        single_queries = len(statements)
+        test_session.expunge_all()
+        listed = [OrderRead.from_orm(o) for o in get_orders(test_session)]
+    finally:
+        event.remove(test_session.get_bind(), "before_cursor_execute", record)
+
+    assert [len(i.allocations) for i in read.items] == [1] * 5
+    assert single_queries == 2
+    assert len(listed) == 3 and all(len(o.items) == 5 for o in listed)
+    assert len(statements) - single_queries == 3
+
 def test_update_order_status(test_session: Session):
     """Tests updating order status"""
     # Create a product and an order
@@ -105,6 +167,31 @@ def test_update_order_status(test_session: Session):
     assert updated_order.id == order.id
     assert updated_order.status == OrderStatus.CONFIRMED
 
+def test_terminal_orders_cannot_change(test_session: Session):
+    """Tests that orders in a terminal status can neither change status nor be deleted"""
+    order = Order(status=OrderStatus.CANCELLED, price=1.0)
+    test_session.add(order)
+    test_session.commit()
+
+    with pytest.raises(HTTPException) as exc:
+        update_order_status(test_session, order.id, OrderStatus.PENDING)
+    assert exc.value.status_code == 409
+    with pytest.raises(HTTPException) as exc:
+        delete_order(test_session, order.id)
+    assert exc.value.status_code == 409
+    # Setting the same status again is a no-op
+    assert update_order_status(test_session, order.id, OrderStatus.CANCELLED).status == OrderStatus.CANCELLED
+
+    app.dependency_overrides[get_db] = lambda: test_session
+    try:
+        client = TestClient(app)
+        assert client.put(f"/orders/{order.id}/status", params={"status": "pending"}).status_code == 409
+        assert client.delete(f"/orders/{order.id}").status_code == 409
+        assert client.put("/orders/999999/status", params={"status": "pending"}).status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+    assert get_order(test_session, order.id).status == OrderStatus.CANCELLED
+
 def test_delete_order(test_session: Session):
     """Tests order deletion"""
     # Create a product and an order
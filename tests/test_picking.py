@@ -0,0 +1,136 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.main import app
+from app.database import get_db, get_read_db
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.crud.picking import create_wave, get_pick_list, get_wave_order_ids
+from app.crud.order import create_order, update_order_status
+from app.crud.warehouse import create_warehouse, set_stock_level
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.schemas.picking import WaveRead
+from app.schemas.warehouse import WarehouseCreate
+from app.utils.allocation import NearestSplitStrategy
+from datetime import datetime, timedelta
+
+# Create products and orders with the given status; `lines` is a list of [(product index, quantity), ...] per order
+def seed(db: Session, statuses, lines):
+    products = [
+        Product(name="Bolt", description="", price=1.0, stock=100, bin_location="B-02"),
+        Product(name="Nut", description="", price=1.0, stock=100, bin_location="A-01"),
+        Product(name="Washer", description="", price=1.0, stock=100, bin_location=None),
+    ]
+    db.add_all(products)
+    db.flush()
+    start = datetime(2024, 1, 1)
+    orders = []
+    for i, (status, order_lines) in enumerate(zip(statuses, lines)):
+        order = Order(created_at=start + timedelta(minutes=i), status=status, price=1.0, items=[
+            OrderItem(product_id=products[p].id, quantity=q) for p, q in order_lines
+        ])
+        orders.append(order)
+    db.add_all(orders)
+    db.commit()
+    return products, orders
+
+def test_create_wave_claims_oldest_confirmed_orders(test_session: Session):
+    """Tests that a wave takes the oldest CONFIRMED orders and moves them to IN_PROGRESS"""
+    _, orders = seed(
+        test_session,
+        [OrderStatus.CONFIRMED, OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.CONFIRMED],
+        [[(0, 1)], [(0, 1)], [(1, 2)], [(2, 3)]]
+    )
+
+    wave = create_wave(test_session, max_orders=2)
+
+    assert wave.order_count == 2
+    assert get_wave_order_ids(test_session, wave.id) == [orders[0].id, orders[2].id]
+    test_session.expire_all()
+    assert [o.status for o in orders] == [
+        OrderStatus.IN_PROGRESS, OrderStatus.PENDING, OrderStatus.IN_PROGRESS, OrderStatus.CONFIRMED
+    ]
+
+    # The remaining confirmed order goes to the next wave
+    second = create_wave(test_session, max_orders=10)
+    assert get_wave_order_ids(test_session, second.id) == [orders[3].id]
+
+def test_create_wave_without_confirmed_orders(test_session: Session):
+    """Tests that creating a wave with nothing to pick fails"""
+    seed(test_session, [OrderStatus.PENDING], [[(0, 1)]])
+
+    with pytest.raises(HTTPException) as exc:
+        create_wave(test_session, max_orders=10)
+    assert exc.value.status_code == 404
+
+def test_pick_list_consolidates_demand_by_bin(test_session: Session):
+    """Tests that the pick list sums demand per product and is sorted by bin location"""
+    products, _ = seed(
+        test_session,
+        [OrderStatus.CONFIRMED] * 3,
+        [[(0, 1), (1, 2)], [(0, 4), (2, 1)], [(1, 1), (1, 1)]]
+    )
+
+    wave = create_wave(test_session, max_orders=10)
+    pick_list = get_pick_list(test_session, wave.id)
+
+    assert [(r.product_id, r.bin_location, r.quantity, r.order_count) for r in pick_list] == [
+        (products[1].id, "A-01", 4, 2),
+        (products[0].id, "B-02", 5, 2),
+        (products[2].id, None, 1, 1),
+    ]
+
+def test_pick_lists_are_split_by_allocation_warehouse(test_session: Session):
+    """Tests that each warehouse gets only the quantities allocated to it"""
+    bolt = Product(name="Bolt", description="", price=1.0, stock=0, bin_location="B-02")
+    nut = Product(name="Nut", description="", price=1.0, stock=0, bin_location="A-01")
+    washer = Product(name="Washer", description="", price=1.0, stock=10)
+    test_session.add_all([bolt, nut, washer])
+    test_session.commit()
+    near = create_warehouse(test_session, WarehouseCreate(code="NEAR", name="Near", priority=0))
+    far = create_warehouse(test_session, WarehouseCreate(code="FAR", name="Far", priority=1))
+    set_stock_level(test_session, near.id, bolt.id, 4)
+    set_stock_level(test_session, far.id, bolt.id, 10)
+    set_stock_level(test_session, far.id, nut.id, 10)
+
+    strategy = NearestSplitStrategy()
+    for lines in ([(bolt, 3), (nut, 1)], [(bolt, 3), (washer, 2)]):
+        order = create_order(test_session, OrderCreate(items=[
+            OrderItemCreate(product_id=p.id, quantity=q) for p, q in lines
+        ]), strategy)
+        update_order_status(test_session, order.id, OrderStatus.CONFIRMED)
+
+    wave = create_wave(test_session, max_orders=10)
+    read = WaveRead.from_wave(wave, [], get_pick_list(test_session, wave.id))
+
+    assert [
+        (p.warehouse_code, [(l.product_name, l.quantity, l.order_count) for l in p.lines]) for p in read.pick_lists
+    ] == [
+        ("NEAR", [("Bolt", 4, 2)]),
+        ("FAR", [("Nut", 1, 1), ("Bolt", 2, 1)]),
+        (None, [("Washer", 2, 1)]),
+    ]
+
+def test_wave_endpoints(test_session: Session):
+    """Tests POST /picking/waves and GET /picking/waves/{id}"""
+    products, orders = seed(test_session, [OrderStatus.CONFIRMED] * 2, [[(0, 2)], [(0, 3), (1, 1)]])
+    app.dependency_overrides[get_db] = lambda: test_session
+    app.dependency_overrides[get_read_db] = lambda: test_session
+    try:
+        client = TestClient(app)
+        response = client.post("/picking/waves", json={"max_orders": 50})
+        assert response.status_code == 200
+        wave = response.json()
+        assert wave["order_count"] == 2
+        assert wave["order_ids"] == [orders[0].id, orders[1].id]
+        pick_list, = wave["pick_lists"]
+        assert pick_list["warehouse_id"] is None
+        assert [(line["product_name"], line["quantity"]) for line in pick_list["lines"]] == [("Nut", 1), ("Bolt", 5)]
+
+        assert client.get(f"/picking/waves/{wave['id']}").json() == wave
+        assert client.get("/picking/waves/999999").status_code == 404
+        assert client.post("/picking/waves", json={"max_orders": 50}).status_code == 404
+        assert client.post("/picking/waves", json={"max_orders": 0}).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
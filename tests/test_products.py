@@ -1,9 +1,11 @@
 import pytest
 from sqlalchemy.orm import Session
 from app.models.product import Product
-from app.crud.product import create_product, get_product, get_products, update_product, delete_product
-from app.schemas.product import ProductCreate, ProductUpdate
+from app.crud.product import create_product, get_product, get_products, get_products_by_ids, update_product, delete_product
+from app.schemas.product import ProductBatchRequest, ProductCreate, ProductUpdate
+from app.utils.params import parse_id_list
 from pydantic import ValidationError
+from fastapi import HTTPException
 
 # Test data
 test_product_data = ProductCreate(
@@ -112,4 +114,39 @@ def test_create_product_invalid_data(test_session: Session):
         create_product(test_session, product_create)
     
     # Check that the error contains the correct message
-    assert "Input should be greater than 0" in str(exc_info.value) 
\ No newline at end of file
+    assert "Input should be greater than 0" in str(exc_info.value)
+
+def test_get_products_by_ids(test_session: Session):
+    """Tests bulk product reads keep request order and skip missing ids"""
+    first = create_product(test_session, test_product_data)
+    second = create_product(test_session, test_product_data)
+
+    products = get_products_by_ids(test_session, [second.id, 999, first.id, second.id])
+
+    assert [p.id for p in products] == [second.id, first.id]
+
+def test_id_lists_reject_out_of_range_ids():
+    """Tests that ids below 1 or beyond int64 are rejected instead of overflowing the query"""
+    assert parse_id_list("1, 2") == [1, 2]
+    for value in (str(10**20), "0", "3,-1"):
+        with pytest.raises(HTTPException) as exc_info:
+            parse_id_list(value)
+        assert exc_info.value.status_code == 400
+
+    for ids in ([10**20], [0], [1, -5]):
+        with pytest.raises(ValidationError):
+            ProductBatchRequest(ids=ids)
+
+def test_get_products_field_projection(test_session: Session):
+    """Tests that field projection returns only the requested columns"""
+    product = create_product(test_session, test_product_data)
+
+    products = get_products_by_ids(test_session, [product.id], fields=["name", "price"])
+
+    assert products == [{"id": product.id, "name": product.name, "price": product.price}]
+
+def test_get_products_unknown_field(test_session: Session):
+    """Tests that projecting an unknown field is rejected"""
+    with pytest.raises(HTTPException) as exc_info:
+        get_products(test_session, fields=["secret"])
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,130 @@
+import inspect
+import re
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.crud import order as order_crud
+from app.crud import picking as picking_crud
+from app.crud import product as product_crud
+from app.crud import warehouse as warehouse_crud
+from app.models.order import OrderStatus
+from app.models.product import Product
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.schemas.warehouse import WarehouseCreate
+
+# Tables expected to grow large; a full scan of any of them fails the check
+LARGE_TABLES = {"pick_waves", "orders", "order_items", "order_item_allocations", "warehouse_stock", "products"}
+
+# Crud functions that list a whole table by design
+FULL_LISTINGS = {"get_products", "get_orders", "get_warehouses"}
+
+# Matches SQLite plan rows such as "SCAN orders" or "SCAN orders USING INDEX ix_orders_created_at"
+SCAN_RE = re.compile(r"^SCAN (\w+)")
+
+# Record every statement (with its parameters) executed on the session's engine
+class StatementRecorder:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+# Run EXPLAIN QUERY PLAN for a statement and return the plan details
+def explain(session: Session, statement: str, parameters) -> list[str]:
+    cursor = session.connection().connection.driver_connection.cursor()
+    try:
+        rows = cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    finally:
+        cursor.close()
+    return [row[-1] for row in rows]
+
+# Get the large tables fully scanned by a plan
+def full_scans(plan: list[str]) -> set[str]:
+    return {m.group(1) for m in map(SCAN_RE.match, plan) if m and m.group(1) in LARGE_TABLES}
+
+@pytest.fixture
+def seeded(test_session: Session):
+    product = Product(name="Seed", description="Seed", price=1.0, stock=0)
+    other = Product(name="Other", description="Other", price=2.0, stock=100)
+    test_session.add_all([product, other])
+    test_session.commit()
+    warehouse = warehouse_crud.create_warehouse(test_session, WarehouseCreate(code="S", name="Seed"))
+    warehouse_crud.set_stock_level(test_session, warehouse.id, product.id, 100)
+    order = order_crud.create_order(test_session, OrderCreate(items=[
+        OrderItemCreate(product_id=product.id, quantity=1),
+        OrderItemCreate(product_id=other.id, quantity=1),
+    ]))
+    return {"product": product, "other": other, "warehouse": warehouse, "order": order}
+
+# One call per crud function; each entry is (module, function name, call)
+CRUD_CALLS = [
+    (product_crud, "create_product", lambda db, s: product_crud.create_product(
+        db, ProductCreate(name="New", description="New", price=1.0, stock=1))),
+    (product_crud, "get_products", lambda db, s: product_crud.get_products(db, fields=["name"])),
+    (product_crud, "get_products_by_ids", lambda db, s: product_crud.get_products_by_ids(db, [s["product"].id], ["name"])),
+    (product_crud, "get_product", lambda db, s: product_crud.get_product(db, s["product"].id)),
+    (product_crud, "update_product", lambda db, s: product_crud.update_product(
+        db, s["other"].id, ProductUpdate(price=3.0))),
+    (product_crud, "delete_product", lambda db, s: product_crud.delete_product(db, product_crud.create_product(
+        db, ProductCreate(name="Tmp", description="Tmp", price=1.0, stock=1)).id)),
+    (order_crud, "create_order", lambda db, s: order_crud.create_order(
+        db, OrderCreate(items=[OrderItemCreate(product_id=s["product"].id, quantity=1)]))),
+    (order_crud, "add_order", lambda db, s: order_crud.add_order(
+        db, OrderCreate(items=[OrderItemCreate(product_id=s["product"].id, quantity=1)]))),
+    (order_crud, "get_orders", lambda db, s: order_crud.get_orders(db)),
+    (order_crud, "get_order", lambda db, s: order_crud.get_order(db, s["order"].id)),
+    (order_crud, "get_orders_for_product", lambda db, s: order_crud.get_orders_for_product(
+        db, s["product"].id, status=OrderStatus.PENDING)),
+    (order_crud, "update_order_status", lambda db, s: order_crud.update_order_status(
+        db, s["order"].id, OrderStatus.CONFIRMED)),
+    (order_crud, "set_order_status", lambda db, s: order_crud.set_order_status(
+        db, s["order"].id, OrderStatus.CONFIRMED)),
+    (order_crud, "get_order_item", lambda db, s: order_crud.get_order_item(db, s["order"].items[0].id)),
+    (order_crud, "delete_order", lambda db, s: order_crud.delete_order(db, s["order"].id)),
+    (warehouse_crud, "create_warehouse", lambda db, s: warehouse_crud.create_warehouse(
+        db, WarehouseCreate(code="N", name="New"))),
+    (warehouse_crud, "get_warehouses", lambda db, s: warehouse_crud.get_warehouses(db)),
+    (warehouse_crud, "get_warehouse", lambda db, s: warehouse_crud.get_warehouse(db, s["warehouse"].id)),
+    (warehouse_crud, "set_stock_level", lambda db, s: warehouse_crud.set_stock_level(
+        db, s["warehouse"].id, s["product"].id, 50)),
+    (warehouse_crud, "get_stock_levels", lambda db, s: warehouse_crud.get_stock_levels(
+        db, product_ids=[s["product"].id])),
+    (warehouse_crud, "get_candidate_locations", lambda db, s: warehouse_crud.get_candidate_locations(
+        db, [s["product"].id])),
+    (picking_crud, "create_wave", lambda db, s: (
+        order_crud.update_order_status(db, s["order"].id, OrderStatus.CONFIRMED), picking_crud.create_wave(db, 100))),
+    (picking_crud, "get_wave", lambda db, s: picking_crud.get_wave(db, 1)),
+    (picking_crud, "get_wave_order_ids", lambda db, s: picking_crud.get_wave_order_ids(db, 1)),
+    (picking_crud, "get_pick_list", lambda db, s: picking_crud.get_pick_list(db, 1)),
+]
+
+def test_every_crud_function_is_checked():
+    """Tests that the query plan check covers every public crud function"""
+    checked = {(module.__name__, name) for module, name, _ in CRUD_CALLS}
+    for module in (product_crud, order_crud, warehouse_crud, picking_crud):
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if func.__module__ == module.__name__ and not name.startswith("_"):
+                assert (module.__name__, name) in checked, f"{module.__name__}.{name} has no query plan check"
+
+@pytest.mark.parametrize("module,name,call", CRUD_CALLS, ids=[name for _, name, _ in CRUD_CALLS])
+def test_crud_query_plans_avoid_full_scans(test_session: Session, seeded, module, name, call):
+    """Tests that crud queries do not fully scan large tables"""
+    with StatementRecorder(test_session.get_bind()) as recorder:
+        call(test_session, seeded)
+
+    assert recorder.statements, f"{name} executed no statements"
+    if name in FULL_LISTINGS:
+        return
+    for statement, parameters in recorder.statements:
+        scans = full_scans(explain(test_session, statement, parameters))
+        assert not scans, f"{name} fully scans {sorted(scans)}:\n{statement}"
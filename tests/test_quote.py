@@ -0,0 +1,119 @@
+import threading
+import time
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.crud.catalog import CatalogSnapshot, catalog_snapshot
+from app.main import app
+from app.crud.order import create_order
+from app.crud.product import create_product, update_product, delete_product
+from app.schemas.order import OrderCreate, OrderItemCreate, QuoteRead
+from app.schemas.product import ProductCreate, ProductUpdate
+
+def _product(session: Session, price: float, stock: int):
+    return create_product(session, ProductCreate(name="Quoted", description="Quoted", price=price, stock=stock))
+
+@pytest.fixture
+def snapshot(test_session: Session):
+    catalog_snapshot.load(test_session)
+    yield catalog_snapshot
+    catalog_snapshot.loaded_at = None
+
+def test_quote_prices_and_checks_stock(test_session: Session):
+    """Tests totals, repeated lines, shortages and unknown products"""
+    cheap = _product(test_session, 2.0, 5)
+    dear = _product(test_session, 10.0, 1)
+    snapshot = CatalogSnapshot()
+    snapshot.load(test_session)
+
+    ok, short = snapshot.quote([
+        [(cheap.id, 2), (dear.id, 1)],
+        [(cheap.id, 3), (cheap.id, 3), (999, 1)],
+    ])
+
+    assert ok["total"] == 14.0
+    assert ok["insufficient"] == [] and ok["missing_product_ids"] == []
+    assert short["total"] == 12.0
+    assert short["missing_product_ids"] == [999]
+    assert short["insufficient"] == [(cheap.id, 6, 5)]
+    assert QuoteRead.from_quote(short).available is False
+
+def test_quote_empty_catalog():
+    """Tests quoting before any product exists"""
+    quote, = CatalogSnapshot().quote([[(1, 1)]])
+    assert quote["total"] == 0.0
+    assert quote["missing_product_ids"] == [1]
+
+def test_snapshot_follows_committed_writes(test_session: Session, snapshot):
+    """Tests that product writes and orders update the snapshot without reloading"""
+    product = _product(test_session, 4.0, 10)
+    assert snapshot.quote([[(product.id, 1)]])[0]["total"] == 4.0
+
+    update_product(test_session, product.id, ProductUpdate(price=5.0))
+    create_order(test_session, OrderCreate(items=[OrderItemCreate(product_id=product.id, quantity=7)]))
+
+    quote, = snapshot.quote([[(product.id, 4)]])
+    assert quote["total"] == 20.0
+    assert quote["insufficient"] == [(product.id, 4, 3)]
+
+    delete_product(test_session, product.id)
+    assert snapshot.quote([[(product.id, 1)]])[0]["missing_product_ids"] == [product.id]
+
+def test_rolled_back_writes_are_ignored(test_session: Session, snapshot):
+    """Tests that uncommitted changes never reach the snapshot"""
+    product = _product(test_session, 4.0, 10)
+    product.stock = 0
+    test_session.flush()
+    test_session.rollback()
+
+    assert snapshot.quote([[(product.id, 10)]])[0]["insufficient"] == []
+
+def test_quote_rejects_out_of_range_values():
+    """Tests that out-of-range product ids and quantities are rejected with 422"""
+    client = TestClient(app)
+    for line in (
+        {"product_id": 1, "quantity": 10**20},
+        {"product_id": 10**20, "quantity": 1},
+        {"product_id": -10**20, "quantity": 1},
+        {"product_id": 0, "quantity": 1},
+    ):
+        assert client.post("/orders/quote", json={"items": [line]}).status_code == 422
+        assert client.post("/orders/", json={"items": [line]}).status_code == 422
+
+def test_stale_snapshot_is_reloaded_once():
+    """Tests that concurrent callers of a stale snapshot trigger a single reload"""
+    snapshot = CatalogSnapshot(max_age=10)
+    snapshot.loaded_at = time.monotonic() - 20
+    loads = []
+
+    def slow_load(db):
+        loads.append(db)
+        time.sleep(0.1)
+        snapshot.loaded_at = time.monotonic()
+
+    snapshot.load = slow_load
+    threads = [threading.Thread(target=snapshot.ensure_loaded, args=(None,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(loads) == 1
+
+def test_apply_does_not_change_arrays_held_by_quotes(test_session: Session):
+    """Tests that applying changes leaves the arrays taken by an in-progress quote untouched"""
+    product = _product(test_session, 1.0, 5)
+    snapshot = CatalogSnapshot()
+    snapshot.load(test_session)
+    snapshot.index_of = np.resize(snapshot.index_of, product.id + 10)
+    snapshot.index_of[product.id + 1:] = -1
+    held = (snapshot.index_of, snapshot.price, snapshot.stock)
+    held_copy = tuple(a.copy() for a in held)
+
+    # A new id below len(index_of) that forces the price/stock arrays to grow
+    snapshot.apply([(product.id + 5, 2.0, 1), (product.id, 3.0, 4)])
+
+    for array, before in zip(held, held_copy):
+        assert np.array_equal(array, before)
+    assert snapshot.quote([[(product.id + 5, 1), (product.id, 1)]])[0]["total"] == 5.0
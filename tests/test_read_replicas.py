@@ -0,0 +1,119 @@
+import threading
+import time
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from app import database
+from app.database import Base, ReadEngineRouter, is_pinned_to_primary, PRIMARY_PIN_COOKIE
+from app.main import app as warehouse_app
+from app.middleware import ReadYourWritesMiddleware
+
+def _engine(path):
+    return create_engine(f"sqlite:///{path}")
+
+def test_round_robin_over_replicas(tmp_path):
+    """Tests that reads alternate between healthy replicas"""
+    primary = _engine(tmp_path / "primary.db")
+    first = _engine(tmp_path / "replica1.db")
+    second = _engine(tmp_path / "replica2.db")
+    router = ReadEngineRouter([first, second], primary)
+
+    picked = [router.next_engine() for _ in range(4)]
+
+    assert picked == [first, second, first, second]
+
+def test_unhealthy_replica_falls_back_to_primary(tmp_path):
+    """Tests that a replica failing its health check is skipped"""
+    primary = _engine(tmp_path / "primary.db")
+    broken = _engine(tmp_path / "missing" / "replica.db")
+    router = ReadEngineRouter([broken], primary, health_check_interval=60)
+
+    assert router.next_engine() is primary
+
+def test_replica_serves_its_own_data(tmp_path):
+    """Tests that a second SQLite file can act as the replica"""
+    primary = _engine(tmp_path / "primary.db")
+    replica = _engine(tmp_path / "replica.db")
+    with replica.begin() as conn:
+        conn.execute(text("CREATE TABLE marker (name TEXT)"))
+        conn.execute(text("INSERT INTO marker VALUES ('replica')"))
+    router = ReadEngineRouter([replica], primary)
+
+    with router.next_engine().connect() as conn:
+        assert conn.execute(text("SELECT name FROM marker")).scalar() == "replica"
+
+def test_slow_health_check_does_not_block_other_reads(tmp_path):
+    """Tests that a replica probe in progress does not hold up requests picking other replicas"""
+    slow, fast = _engine(tmp_path / "slow.db"), _engine(tmp_path / "fast.db")
+    release = threading.Event()
+
+    # Connecting to the slow replica blocks until released, then fails
+    @event.listens_for(slow, "do_connect")
+    def _block(dialect, conn_rec, cargs, cparams):
+        release.wait()
+        raise RuntimeError("unreachable")
+
+    router = ReadEngineRouter([slow, fast], _engine(tmp_path / "primary.db"), health_check_interval=60)
+    probing = threading.Thread(target=router.next_engine)
+    probing.start()
+    try:
+        while router._checked_at[id(slow)] == 0.0:
+            time.sleep(0.001)
+        started = time.monotonic()
+        assert router.next_engine() is fast
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        probing.join()
+
+# Create the schema with one product named `name` in a SQLite file
+def _database_with_product(path, name: str):
+    engine = _engine(path)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO products (name, description, price, stock) VALUES (:n, '', 1.0, 1)"), {"n": name})
+    return engine
+
+def test_get_handler_reads_from_replica(tmp_path, monkeypatch):
+    """Tests that GET handlers read through the replica engine"""
+    primary = _database_with_product(tmp_path / "primary.db", "from primary")
+    replica = _database_with_product(tmp_path / "replica.db", "from replica")
+    monkeypatch.setattr(database, "read_router", ReadEngineRouter([replica], primary))
+
+    response = TestClient(warehouse_app).get("/products/")
+
+    assert [p["name"] for p in response.json()] == ["from replica"]
+
+def test_replica_failing_between_checks_fails_over(tmp_path, monkeypatch):
+    """Tests that a replica that became unreachable after its last check is skipped and marked unhealthy"""
+    primary = _database_with_product(tmp_path / "primary.db", "from primary")
+    broken = _engine(tmp_path / "missing" / "replica.db")
+    router = ReadEngineRouter([broken], primary, health_check_interval=60)
+    router._checked_at[id(broken)] = time.monotonic()
+    monkeypatch.setattr(database, "read_router", router)
+
+    response = TestClient(warehouse_app).get("/products/")
+
+    assert response.status_code == 200
+    assert [p["name"] for p in response.json()] == ["from primary"]
+    assert router.next_engine() is primary
+
+def test_write_pins_client_to_primary():
+    """Tests that a successful write sets the read-your-writes cookie"""
+    app = FastAPI()
+
+    @app.post("/items")
+    def write():
+        return {}
+
+    @app.get("/items")
+    def read(request: Request):
+        return {"pinned": is_pinned_to_primary(request.cookies)}
+
+    app.add_middleware(ReadYourWritesMiddleware, window=5)
+    client = TestClient(app)
+
+    assert client.get("/items").json() == {"pinned": False}
+    response = client.post("/items")
+    assert float(response.cookies[PRIMARY_PIN_COOKIE]) > time.time()
+    assert client.get("/items").json() == {"pinned": True}
@@ -0,0 +1,119 @@
+import asyncio
+from app.middleware.single_flight import SingleFlightMiddleware, SingleFlightStats
+
+# Minimal ASGI app counting executions; responses wait on `release` so requests overlap
+class SlowApp:
+    def __init__(self):
+        self.calls = 0
+        self.release = None
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        body = f"call {self.calls}".encode()
+        if scope["method"] == "GET":
+            await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": body})
+
+def _scope(method: str = "GET", path: str = "/products/", query: bytes = b""):
+    return {"type": "http", "method": method, "path": path, "query_string": query, "headers": []}
+
+async def _request(middleware, scope):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+
+def test_concurrent_identical_requests_share_one_execution():
+    """Tests that identical concurrent GETs run the handler once"""
+    async def scenario():
+        app, stats = SlowApp(), SingleFlightStats()
+        app.release = asyncio.Event()
+        middleware = SingleFlightMiddleware(app, stats=stats)
+        tasks = [asyncio.create_task(_request(middleware, _scope())) for _ in range(5)]
+        other = asyncio.create_task(_request(middleware, _scope(query=b"ids=1")))
+        await asyncio.sleep(0)
+        app.release.set()
+        bodies = await asyncio.gather(*tasks)
+        await other
+
+        assert app.calls == 2
+        assert set(bodies) == {b"call 1"}
+        assert (stats.requests, stats.executions, stats.coalesced) == (6, 2, 4)
+        assert stats.coalescing_ratio == 4 / 6
+    asyncio.run(scenario())
+
+def test_micro_cache_is_cleared_by_writes():
+    """Tests reuse within the micro-cache window and invalidation by a write"""
+    async def scenario():
+        app, stats = SlowApp(), SingleFlightStats()
+        app.release = asyncio.Event()
+        app.release.set()
+        middleware = SingleFlightMiddleware(app, cache_seconds=60, stats=stats)
+
+        assert await _request(middleware, _scope()) == b"call 1"
+        assert await _request(middleware, _scope()) == b"call 1"
+        assert stats.cache_hits == 1
+        await _request(middleware, _scope(method="POST"))
+        assert await _request(middleware, _scope()) == b"call 3"
+    asyncio.run(scenario())
+
+def test_read_only_posts_keep_the_micro_cache():
+    """Tests that read-only POSTs such as quotes do not invalidate cached GETs"""
+    async def scenario():
+        app, stats = SlowApp(), SingleFlightStats()
+        app.release = asyncio.Event()
+        app.release.set()
+        middleware = SingleFlightMiddleware(app, cache_seconds=60, stats=stats)
+
+        assert await _request(middleware, _scope()) == b"call 1"
+        await _request(middleware, _scope(method="POST", path="/orders/quote"))
+        await _request(middleware, _scope(method="POST", path="/products/batch"))
+        assert await _request(middleware, _scope()) == b"call 1"
+        assert stats.cache_hits == 1
+    asyncio.run(scenario())
+
+# ASGI app serving a value that POST replaces; POST commits only once `commit` is set
+class StoreApp:
+    def __init__(self):
+        self.value = b"old"
+        self.commit = asyncio.Event()
+
+    async def __call__(self, scope, receive, send):
+        if scope["method"] == "POST":
+            await self.commit.wait()
+            self.value = b"new"
+        body = self.value
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+
+def test_get_overlapping_a_write_is_not_cached():
+    """Tests that a GET served while a write is in flight is not reused after the write completes"""
+    async def scenario():
+        app = StoreApp()
+        middleware = SingleFlightMiddleware(app, cache_seconds=60, stats=SingleFlightStats())
+
+        write = asyncio.create_task(_request(middleware, _scope(method="POST")))
+        await asyncio.sleep(0)
+        assert await _request(middleware, _scope()) == b"old"
+        app.commit.set()
+        await write
+        assert await _request(middleware, _scope()) == b"new"
+    asyncio.run(scenario())
+
+def test_other_routes_are_not_coalesced():
+    """Tests that routes outside the configured list pass straight through"""
+    async def scenario():
+        app, stats = SlowApp(), SingleFlightStats()
+        app.release = asyncio.Event()
+        app.release.set()
+        middleware = SingleFlightMiddleware(app, stats=stats)
+        await _request(middleware, _scope(path="/warehouses/"))
+        assert stats.requests == 0
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy.orm import Session
+from app.models.product import Product
+from app.crud.order import create_order
+from app.crud.warehouse import create_warehouse, set_stock_level, get_stock_levels
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.schemas.warehouse import WarehouseCreate
+from app.utils.allocation import (
+    StockLocation, AllocationError, SingleWarehouseFirstStrategy, NearestSplitStrategy
+)
+
+def _product(session: Session, name: str = "Test Product") -> Product:
+    product = Product(name=name, description="Test Description", price=10.0, stock=0)
+    session.add(product)
+    session.commit()
+    return product
+
+def test_single_first_prefers_whole_order_warehouse():
+    """Tests that one warehouse holding the whole order wins over nearer partial ones"""
+    locations = {
+        1: [StockLocation(10, 0, 5), StockLocation(20, 1, 5)],
+        2: [StockLocation(20, 1, 5)],
+    }
+    allocation = SingleWarehouseFirstStrategy().allocate({1: 3, 2: 2}, locations)
+    assert allocation == {1: [(20, 3)], 2: [(20, 2)]}
+
+def test_single_first_splits_as_last_resort():
+    """Tests that a line is split across warehouses only when no single one covers it"""
+    locations = {1: [StockLocation(10, 0, 2), StockLocation(20, 1, 3)]}
+    assert SingleWarehouseFirstStrategy().allocate({1: 3}, locations) == {1: [(20, 3)]}
+    assert SingleWarehouseFirstStrategy().allocate({1: 4}, locations) == {1: [(10, 2), (20, 2)]}
+
+def test_nearest_split_reports_shortfall():
+    """Tests that the split strategy raises with the missing quantity"""
+    locations = {1: [StockLocation(10, 0, 2)]}
+    assert NearestSplitStrategy().allocate({1: 2}, locations) == {1: [(10, 2)]}
+    with pytest.raises(AllocationError) as exc_info:
+        NearestSplitStrategy().allocate({1: 5}, locations)
+    assert exc_info.value.shortfalls == {1: 3}
+
+def test_set_stock_level_updates_product_total(test_session: Session):
+    """Tests that per-warehouse stock keeps the product total in sync"""
+    product = _product(test_session)
+    east = create_warehouse(test_session, WarehouseCreate(code="E", name="East", priority=0))
+    west = create_warehouse(test_session, WarehouseCreate(code="W", name="West", priority=1))
+
+    set_stock_level(test_session, east.id, product.id, 4)
+    set_stock_level(test_session, west.id, product.id, 6)
+
+    assert product.stock == 10
+    levels = get_stock_levels(test_session, product_ids=[product.id])
+    assert [(l.warehouse_id, l.quantity) for l in levels] == [(east.id, 4), (west.id, 6)]
+
+def test_create_order_allocates_across_warehouses(test_session: Session):
+    """Tests that order lines are allocated and warehouse stock is decremented"""
+    product = _product(test_session)
+    east = create_warehouse(test_session, WarehouseCreate(code="E", name="East", priority=0))
+    west = create_warehouse(test_session, WarehouseCreate(code="W", name="West", priority=1))
+    set_stock_level(test_session, east.id, product.id, 3)
+    set_stock_level(test_session, west.id, product.id, 3)
+
+    order = create_order(test_session, OrderCreate(items=[
+        OrderItemCreate(product_id=product.id, quantity=2),
+        OrderItemCreate(product_id=product.id, quantity=2),
+    ]))
+
+    allocations = [(a.warehouse_id, a.quantity) for item in order.items for a in item.allocations]
+    assert sorted(allocations) == sorted([(east.id, 2), (east.id, 1), (west.id, 1)])
+    assert product.stock == 2
+    levels = {l.warehouse_id: l.quantity for l in get_stock_levels(test_session, product_ids=[product.id])}
+    assert levels == {east.id: 0, west.id: 2}